@@ -58,10 +58,11 @@ export function ChatInterface({ transcript }) {
 
             if (!response.ok) throw new Error("Chat request failed")
 
-            // Stream the response
+            // Stream the response (Server-Sent Events, one JSON-encoded token per event)
             const reader = response.body.getReader()
             const decoder = new TextDecoder()
             let assistantMessage = ''
+            let buffer = ''
 
             setMessages(prev => [...prev, { role: 'assistant', content: '' }])
 
@@ -69,8 +70,20 @@ export function ChatInterface({ transcript }) {
                 const { done, value } = await reader.read()
                 if (done) break
 
-                const chunk = decoder.decode(value)
-                assistantMessage += chunk
+                buffer += decoder.decode(value, { stream: true })
+                const events = buffer.split('\n\n')
+                buffer = events.pop()
+
+                for (const event of events) {
+                    const lines = event.split('\n')
+                    const data = lines.find(line => line.startsWith('data: '))
+                    if (!data) continue // keep-alive comment
+
+                    if (lines.includes('event: error')) {
+                        throw new Error(JSON.parse(data.slice(6)))
+                    }
+                    assistantMessage += JSON.parse(data.slice(6))
+                }
 
                 setMessages(prev => {
                     const newHistory = [...prev]
@@ -43,7 +43,7 @@ export const apiService = {
 
     // Transcribe URL
     transcribeUrl: async (url, options) => {
-        // options: { device, model, language }
+        // options: { device, model, language, compute_type }
         return API.post('/transcribe/url', { url, ...options });
     },
 
@@ -56,6 +56,7 @@ export const apiService = {
         if (options.language) formData.append('language', options.language);
         if (options.model) formData.append('model', options.model);
         if (options.device) formData.append('device', options.device);
+        if (options.compute_type) formData.append('compute_type', options.compute_type);
 
         return API.post('/transcribe/file', formData, {
             onUploadProgress: (progressEvent) => {
@@ -77,7 +78,8 @@ export const apiService = {
             file_path: filePath,
             language: options.language,
             model: options.model,
-            device: options.device
+            device: options.device,
+            compute_type: options.compute_type
         })
     },
 
@@ -126,7 +128,7 @@ export const apiService = {
 }
 
 // Helper to poll job status
-export const pollJob = async (jobId, onStatus, interval = 2000) => {
+const pollJobStatus = async (jobId, onStatus, interval = 2000) => {
     return new Promise((resolve, reject) => {
         const check = async () => {
             try {
@@ -149,3 +151,32 @@ export const pollJob = async (jobId, onStatus, interval = 2000) => {
         check()
     })
 }
+
+// Subscribe to job status updates over Server-Sent Events, falling back to polling
+export const pollJob = (jobId, onStatus, interval = 2000) => {
+    if (typeof EventSource === 'undefined') {
+        return pollJobStatus(jobId, onStatus, interval)
+    }
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`/api/jobs/${jobId}/events`)
+
+        source.onmessage = (event) => {
+            const job = JSON.parse(event.data)
+
+            onStatus(job)
+
+            if (job.status === 'completed') {
+                source.close()
+                resolve(job)
+            } else if (job.status === 'failed') {
+                source.close()
+                reject(new Error(job.error || 'Job failed'))
+            }
+        }
+
+        source.onerror = () => {
+            source.close()
+            pollJobStatus(jobId, onStatus, interval).then(resolve, reject)
+        }
+    })
+}
@@ -24,16 +24,26 @@ def start_server(port: int = 8000):
     src_path = os.path.join(project_root, "src")
     env["PYTHONPATH"] = src_path + os.pathsep + env.get("PYTHONPATH", "")
     
-    print(f"🚀 Starting Video Summarizer Backend on port {port}...")
+    cmd = [
+        sys.executable, "-m", "uvicorn", 
+        "video_summarizer.api.main:app", 
+        "--host", "0.0.0.0",
+        "--port", str(port),
+    ]
+    if os.getenv("ENV", "dev") == "prod":
+        workers = os.getenv("WEB_CONCURRENCY") or str(os.cpu_count() or 1)
+        cmd += [
+            "--workers", workers,
+            "--loop", "uvloop",
+            "--http", "httptools",
+            "--no-access-log",
+        ]
+        print(f"🚀 Starting Video Summarizer Backend on port {port} ({workers} workers)...")
+    else:
+        cmd += ["--reload", "--reload-dir", src_path]
+        print(f"🚀 Starting Video Summarizer Backend on port {port}...")
     try:
-        subprocess.check_call([
-            sys.executable, "-m", "uvicorn", 
-            "video_summarizer.api.main:app", 
-            "--host", "0.0.0.0",
-            "--port", str(port),
-            "--reload",
-            "--reload-dir", src_path
-        ], env=env)
+        subprocess.check_call(cmd, env=env)
     except KeyboardInterrupt:
         print("\n👋 Server stopped.")
     except subprocess.CalledProcessError as e:
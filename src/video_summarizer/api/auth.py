@@ -7,9 +7,11 @@ from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 from video_summarizer.db import get_db, User
+from video_summarizer.config import load_env
 
 # Secret key (should be in env, but hardcoding for demo simplicity if env missing)
 import os
+load_env()
 SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key-change-me")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 3000 # Long expiry for convenience
@@ -1,34 +1,52 @@
 
+import asyncio
+import copy
+import hashlib
+import json
+import multiprocessing
 import os
 import shutil
-import uuid
-from typing import Dict, Optional, Any, List
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, Dict, Optional, Any, List
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from secrets import token_hex
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Form, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Form, Depends, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from pydantic_core import to_json
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, load_only
 from contextlib import asynccontextmanager
 
 from video_summarizer.transcription import (
     is_youtube_url,
     download_video,
-    extract_audio,
-    WhisperTranscriber,
-    save_srt,
-    format_as_srt
+    extract_audio_array,
+    get_transcriber,
+    pin_transcriber_gpu,
+    load_srt,
+    format_as_srt,
+    srt_to_text
 )
-from video_summarizer.llm import VideoSummarizer, create_chat_session
+from video_summarizer.llm import VideoSummarizer, ChatSession
+from video_summarizer.llm.chat import ChatMessage
 from video_summarizer.llm.clip_extractor import extract_clips as extract_video_clips, save_clips_metadata, merge_clips
 
 # DB & Auth Imports
 from video_summarizer.db import models, database, get_db
 from video_summarizer.api import auth
-from video_summarizer.config import get_config, ALLOWED_LANGUAGES
+from video_summarizer.config import get_config, ALLOWED_LANGUAGES, COMPUTE_TYPES
+from video_summarizer.utils import atomic_write, sortable_id, TTLCache
 
 # --- Constants & Helper Classes ---
 
@@ -38,13 +56,68 @@ class JobStatus:
     COMPLETED = "completed"
     FAILED = "failed"
 
+# --- Cached Pipeline Objects ---
+
+# lru_cache doesn't serialize misses, so two threads asking for the same
+# key at once would both build it; the lock makes the first build the only one
+_pipeline_lock = threading.Lock()
+
+@lru_cache(maxsize=16)
+def _build_summarizer(provider: Optional[str], model: Optional[str]) -> VideoSummarizer:
+    return VideoSummarizer(provider=provider, model=model)
+
+def get_summarizer(provider: Optional[str], model: Optional[str]) -> VideoSummarizer:
+    """Get a summarizer per (provider, model), reusing its LLM client across requests."""
+    with _pipeline_lock:
+        return _build_summarizer(provider, model)
+
+# --- Job Output Directories ---
+
+OUTPUT_ROOT = Path("output")
+
+def job_output_dir(job_id: str) -> Path:
+    """Get the output directory of a job (created once by ``create_job``)."""
+    return OUTPUT_ROOT / job_id
+
+# Transcripts keyed by a digest of the decoded audio, shared across jobs and users
+TRANSCRIPT_CACHE_DIR = OUTPUT_ROOT / "cache" / "transcripts"
+
+def _audio_digest(audio) -> str:
+    """SHA-256 of decoded PCM, so re-encodes and renames of the same audio still match."""
+    return hashlib.sha256(memoryview(audio).cast("B")).hexdigest()
+
+def _check_compute_type(compute_type: Optional[str]):
+    if compute_type is not None and compute_type not in COMPUTE_TYPES:
+        raise HTTPException(status_code=400, detail=f"compute_type must be one of: {', '.join(COMPUTE_TYPES)}")
+
+def create_job(db: Session, job_type: str) -> str:
+    """Insert a pending job and create its output directory."""
+    job_id = sortable_id()
+    db.add(models.Job(id=job_id, type=job_type, status=JobStatus.PENDING))
+    db.commit()
+    os.makedirs(job_output_dir(job_id), exist_ok=True)
+    return job_id
+
 # --- Background Tasks ---
 
-def process_transcription(job_id: str, source: str, model: str, language: str, device: str, user_id: int):
+# Minimum interval between transcription progress updates on a job
+TRANSCRIBE_PROGRESS_SECONDS = 2.0
+
+def process_transcription(
+    job_id: str,
+    source: str,
+    model: str,
+    language: str,
+    device: str,
+    user_id: int,
+    compute_type: Optional[str] = None,
+    source_url: Optional[str] = None
+):
+    # source_url is set when source is a video already downloaded from that URL
     # Create a new session for background task
     db = database.SessionLocal()
     try:
-        job = db.query(models.Job).filter(models.Job.id == job_id).first()
+        job = db.get(models.Job, job_id)
         if not job:
             return
         
@@ -52,7 +125,7 @@ def process_transcription(job_id: str, source: str, model: str, language: str, d
         config = get_config()
         validated_language = config.whisper.validate_language(language)
         
-        # Helper to update job in DB
+        # Helper to update job in DB (also commits any other pending ORM changes)
         def update_job(status, result=None, error=None):
             job.status = status
             job.updated_at = datetime.utcnow()
@@ -66,21 +139,21 @@ def process_transcription(job_id: str, source: str, model: str, language: str, d
             db.commit()
 
         update_job(JobStatus.PROCESSING, {"step": "Starting transcription pipeline..."})
-        output_dir = Path(f"output/{job_id}")
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = job_output_dir(job_id)
         
         try:
             # 1. Handle Source (Download or File)
             video_path = source
             title = "Uploaded Video"
-            source_url = None
             
-            if is_youtube_url(source):
+            if source_url is None and is_youtube_url(source):
                 update_job(JobStatus.PROCESSING, {"step": "Downloading video..."})
                 video_info = download_video(source, output_dir=str(output_dir)) 
                 video_path = video_info
-                title = f"YouTube Video {job_id[:8]}"
                 source_url = source
+            if source_url:
+                # sortable_id leads with the timestamp; the random tail tells videos apart
+                title = f"YouTube Video {job_id[-8:]}"
                 
             # Create Video Entry in DB
             db_video = models.Video(
@@ -91,40 +164,53 @@ def process_transcription(job_id: str, source: str, model: str, language: str, d
                 user_id=user_id
             )
             db.add(db_video)
-            db.commit()
-            db.refresh(db_video)
+            db.flush()  # assigns db_video.id
             
-            # Link Job to Video
+            # Link Job to Video; committed together with the next step
             job.video_id = db_video.id
-            db.commit()
 
             # 2. Extract Audio
             update_job(JobStatus.PROCESSING, {"step": "Extracting audio..."})
-            audio_path = extract_audio(video_path)
+            audio = extract_audio_array(video_path)
                 
-            # 3. Transcribe (using large-v3 model enforced in config)
-            update_job(JobStatus.PROCESSING, {"step": f"Transcribing audio ({validated_language})..."})
-            transcriber = WhisperTranscriber(language=validated_language, device=device)
-            segments = transcriber.transcribe(audio_path)
-            
-            # Save SRT
+            # 3. Transcribe (using large-v3 model enforced in config), unless
+            # the same audio was already transcribed with this model and language
             srt_path = output_dir / "transcript.srt"
-            save_srt(segments, srt_path)
+            cached_srt = TRANSCRIPT_CACHE_DIR / f"{_audio_digest(audio)}.{config.whisper.model}.{validated_language}.srt"
+            if cached_srt.is_file():
+                update_job(JobStatus.PROCESSING, {"step": "Loading cached transcript..."})
+                segments = load_srt(cached_srt)
+                shutil.copyfile(cached_srt, srt_path)
+            else:
+                update_job(JobStatus.PROCESSING, {"step": f"Transcribing audio ({validated_language})..."})
+                transcriber = get_transcriber(device=device, compute_type=compute_type)
+                duration = len(audio) / 16000
+                segments = []
+                last_report = time.monotonic()
+                for segment in transcriber.transcribe_streaming(audio, language=validated_language):
+                    segments.append(segment)
+                    # Report how far decoding has got, throttled to keep DB writes rare
+                    if duration and time.monotonic() - last_report >= TRANSCRIBE_PROGRESS_SECONDS:
+                        progress = min(segment.end / duration, 1.0)
+                        update_job(JobStatus.PROCESSING, {
+                            "step": f"Transcribing audio ({validated_language})... {progress:.0%}",
+                            "progress": round(progress, 3),
+                            "segments_count": len(segments)
+                        })
+                        last_report = time.monotonic()
+                # Format once for both the job copy and the cache entry
+                srt_content = format_as_srt(segments)
+                atomic_write(srt_path, srt_content)
+                atomic_write(cached_srt, srt_content)
             
             # Save Raw Text
             text_path = output_dir / "transcript.txt"
             plain_text = "\n".join(seg.text for seg in segments)
-            with open(text_path, "w", encoding="utf-8") as f:
-                f.write(plain_text)
+            atomic_write(text_path, plain_text)
             
-            # Update Video with transcript data for library reuse
+            # Update Video with transcript data for library reuse (committed with the job)
             db_video.transcript_text = plain_text
             db_video.transcript_path = str(text_path)
-            db.commit()
-
-            # Cleanup
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
 
             update_job(JobStatus.COMPLETED, {
                 "message": "Transcription successful",
@@ -143,6 +229,196 @@ def process_transcription(job_id: str, source: str, model: str, language: str, d
         db.close()
 
 
+def _init_worker(worker_counter):
+    # Connections inherited from the parent process must not be reused after fork
+    database.engine.dispose(close=False)
+    # Each worker runs one job at a time, so it gets one GPU rather than a replica on all
+    with worker_counter.get_lock():
+        slot = worker_counter.value
+        worker_counter.value += 1
+    pin_transcriber_gpu(slot)
+    if get_config().whisper.warmup:
+        _warm_transcriber()
+
+
+def _warm_transcriber():
+    """Load the default transcriber and run a second of silence through it."""
+    import numpy as np
+    
+    started = time.perf_counter()
+    try:
+        # Same cache key as a default request in process_transcription
+        transcriber = get_transcriber(device="auto")
+        transcriber.transcribe(np.zeros(16000, dtype=np.float32))
+        print(f"🔥 Whisper warmed up in worker {os.getpid()} ({time.perf_counter() - started:.1f}s)")
+    except Exception as e:
+        print(f"⚠️  Whisper warm-up failed in worker {os.getpid()}: {type(e).__name__}: {e}")
+
+
+def _noop():
+    pass
+
+
+async def run_in_pool(func, *args):
+    """Run a blocking pipeline stage in the worker process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.pool, func, *args)
+
+
+# Completion events for jobs running in the worker pool (one wake-up per job)
+job_events: Dict[str, asyncio.Event] = {}
+
+# Pipeline load, updated on the event loop only (exposed by /api/metrics)
+pipeline_stats = {"downloads_waiting": 0, "downloads_active": 0, "jobs_in_pool": 0}
+
+async def run_job(job_id: str, func, *args):
+    """Run a job in the worker pool and wake any event-stream listeners when it ends."""
+    event = job_events.setdefault(job_id, asyncio.Event())
+    pipeline_stats["jobs_in_pool"] += 1
+    try:
+        await run_in_pool(func, job_id, *args)
+    finally:
+        pipeline_stats["jobs_in_pool"] -= 1
+        event.set()
+        job_events.pop(job_id, None)
+
+
+def _set_job_state(job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+    db = database.SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        if job:
+            job.status = status
+            job.updated_at = datetime.utcnow()
+            if result:
+                job.result = {**(job.result or {}), **result}
+            if error:
+                job.error = error
+            db.commit()
+    finally:
+        db.close()
+
+
+def _find_downloaded_video(url: str) -> Optional[str]:
+    """Path of a previous download of url that is still on disk, if any."""
+    db = database.SessionLocal()
+    try:
+        rows = db.query(models.Video.file_path).filter(models.Video.source_url == url).order_by(models.Video.id.desc())
+        for (file_path,) in rows:
+            if file_path and os.path.isfile(file_path):
+                return file_path
+        return None
+    finally:
+        db.close()
+
+async def run_url_job(job_id: str, url: str, *args):
+    """Download a YouTube video in a thread, then transcribe it in the worker pool."""
+    if not is_youtube_url(url):
+        await run_job(job_id, process_transcription, url, *args)
+        return
+    
+    # The same URL was downloaded before: reuse that file (its transcript is cached too)
+    video_path = await asyncio.to_thread(_find_downloaded_video, url)
+    if video_path:
+        await run_job(job_id, process_transcription, video_path, *args, url)
+        return
+    
+    try:
+        await asyncio.to_thread(_set_job_state, job_id, JobStatus.PROCESSING, {"step": "Downloading video..."})
+        pipeline_stats["downloads_waiting"] += 1
+        try:
+            await app.state.download_slots.acquire()
+        finally:
+            pipeline_stats["downloads_waiting"] -= 1
+        pipeline_stats["downloads_active"] += 1
+        try:
+            video_path = await asyncio.to_thread(download_video, url, output_dir=str(job_output_dir(job_id)))
+        finally:
+            pipeline_stats["downloads_active"] -= 1
+            app.state.download_slots.release()
+    except Exception as e:
+        await asyncio.to_thread(_set_job_state, job_id, JobStatus.FAILED, None, str(e))
+        event = job_events.pop(job_id, None)
+        if event:
+            event.set()
+        return
+    
+    # process_transcription(job_id, source, model, language, device, user_id, compute_type, source_url)
+    await run_job(job_id, process_transcription, video_path, *args, url)
+
+
+async def run_url_jobs(jobs: List[tuple], *args):
+    """Run (job_id, url) jobs concurrently; the download slots and pool bound the actual work."""
+    await asyncio.gather(*(run_url_job(job_id, url, *args) for job_id, url in jobs))
+
+
+# Finished jobs stay queryable for a day; the video library keeps the results
+JOB_TTL = timedelta(hours=24)
+# Processing jobs with no progress for this long were lost (e.g. server restart)
+JOB_STALL_TIMEOUT = timedelta(hours=2)
+JOB_REAP_INTERVAL_SECONDS = 600
+# Pending jobs get no progress updates while queued, so only those left over
+# from before this process started are known to be orphaned
+PROCESS_STARTED_AT = datetime.utcnow()
+
+def purge_expired_jobs() -> int:
+    """Delete completed and failed jobs that have not changed within JOB_TTL."""
+    db = database.SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - JOB_TTL
+        count = db.query(models.Job).filter(
+            models.Job.status.in_([JobStatus.COMPLETED, JobStatus.FAILED]),
+            models.Job.updated_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+def fail_stalled_jobs() -> int:
+    """
+    Mark lost jobs as failed.
+    
+    Processing jobs are lost after JOB_STALL_TIMEOUT without progress. Pending
+    jobs may sit in the queue behind a long batch without updates, so they
+    only count once they are also older than this process.
+    """
+    db = database.SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - JOB_STALL_TIMEOUT
+        count = db.query(models.Job).filter(
+            or_(
+                models.Job.status == JobStatus.PROCESSING,
+                and_(models.Job.status == JobStatus.PENDING, models.Job.updated_at < PROCESS_STARTED_AT),
+            ),
+            models.Job.updated_at < cutoff
+        ).update({
+            "status": JobStatus.FAILED,
+            "error": "Job was interrupted (no progress, possibly a server restart). Please submit it again.",
+            "updated_at": datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+async def reap_expired_jobs():
+    while True:
+        try:
+            stalled = await asyncio.to_thread(fail_stalled_jobs)
+            if stalled:
+                print(f"[Jobs] Marked {stalled} stalled jobs as failed")
+            purged = await asyncio.to_thread(purge_expired_jobs)
+            if purged:
+                print(f"[Jobs] Purged {purged} expired jobs")
+            purged = await asyncio.to_thread(purge_expired_chats)
+            if purged:
+                print(f"[Chat] Purged {purged} expired sessions")
+        except Exception as e:
+            print(f"[Jobs ERROR] Purge failed: {type(e).__name__}: {e}")
+        await asyncio.sleep(JOB_REAP_INTERVAL_SECONDS)
+
+
 # --- Database Lifespan ---
 
 @asynccontextmanager
@@ -152,20 +428,77 @@ async def lifespan(app: FastAPI):
     print(f"🌐 SERVING FRONTEND FROM: {static_dir}")
     # Create Tables
     models.Base.metadata.create_all(bind=database.engine)
+    # create_all skips tables that already exist, so add indexes introduced since
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=database.engine, checkfirst=True)
     # Ensure output dir
-    Path("output").mkdir(exist_ok=True)
-    yield
+    OUTPUT_ROOT.mkdir(exist_ok=True)
+    TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Worker processes for CPU/GPU-bound stages (Whisper, FFmpeg)
+    config = get_config()
+    for error in config.validate():
+        print(f"⚠️  {error}")
+    app.state.pool = ProcessPoolExecutor(
+        max_workers=config.whisper.workers,
+        initializer=_init_worker,
+        initargs=(multiprocessing.Value("i", 0),),
+    )
+    if config.whisper.warmup:
+        # Submitting one task per worker spawns them all now; each loads the
+        # model in its initializer instead of during the first request
+        for _ in range(config.whisper.workers):
+            app.state.pool.submit(_noop)
+    # Downloads are network-bound, so more run at once than there are pool
+    # workers; created here so the semaphore belongs to the server's loop
+    app.state.download_slots = asyncio.Semaphore(config.downloader.max_concurrent)
+    # Upload copies get their own threads so large files don't hold the shared request threadpool
+    app.state.disk_pool = ThreadPoolExecutor(thread_name_prefix="disk")
+    reaper = asyncio.create_task(reap_expired_jobs())
+    try:
+        yield
+    finally:
+        reaper.cancel()
+        app.state.pool.shutdown(wait=False, cancel_futures=True)
+        app.state.disk_pool.shutdown(wait=False, cancel_futures=True)
 
-app = FastAPI(title="Video Summarizer API", version="0.2.0", lifespan=lifespan)
+class APIJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic-core's Rust serializer instead of the stdlib json module."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+app = FastAPI(title="Video Summarizer API", version="0.2.0", lifespan=lifespan, default_response_class=APIJSONResponse)
 
 # --- Configuration ---
 
+class APIGZipMiddleware(GZipMiddleware):
+    """Gzip JSON API responses only; videos are already compressed and streams must not be buffered."""
+
+    UNCOMPRESSED_PATHS = ("/api/clips/download", "/api/chat/message")
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if (
+            path.startswith("/api/")
+            and not path.startswith(self.UNCOMPRESSED_PATHS)
+            and not path.endswith("/events")
+        ):
+            await super().__call__(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+# Transcripts in library/job responses are large, highly compressible text
+app.add_middleware(APIGZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"], # Allow all for simplicity, or restrict to localhost
+    allow_origins=get_config().api.cors_origins, # CORS_ORIGINS, defaults to any origin
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    # Let browsers reuse a preflight instead of sending one before every poll
+    max_age=get_config().api.cors_max_age,
 )
 
 # Static Files
@@ -181,8 +514,29 @@ else:
     static_dir = frontend_src # Only js folder usually exists here
     print(f"⚠️  Production build not found. Serving from: {static_dir}")
 
-# Mount 'output' for accessing generated files
-app.mount("/output", StaticFiles(directory="output"), name="output")
+# Job artifacts are written once under a unique job id and never change afterwards
+OUTPUT_CACHE_CONTROL = "public, max-age=3600, immutable"
+
+class OutputFiles(StaticFiles):
+    """
+    Serve job artifacts with long-lived cache headers, in large chunks.
+    
+    Headers are set here rather than in an HTTP middleware so video bytes
+    go straight to the server; under a server with the ASGI pathsend
+    extension, FileResponse hands the whole file to it for a zero-copy send.
+    """
+
+    chunk_size = 1 << 20  # Outputs are mostly video; 64 KiB reads mean a thread hop per 64 KiB
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if isinstance(response, FileResponse):
+            response.chunk_size = self.chunk_size
+        response.headers["Cache-Control"] = OUTPUT_CACHE_CONTROL
+        return response
+
+# Mount 'output' for accessing generated files (created in lifespan, so skip the import-time check)
+app.mount("/output", OutputFiles(directory=OUTPUT_ROOT, html=False, check_dir=False), name="output")
 
 # Mount assets if they exist (Vite structure)
 if (static_dir / "assets").exists():
@@ -191,6 +545,18 @@ if (static_dir / "assets").exists():
 # Include Auth Router
 app.include_router(auth.router)
 
+# --- Metrics Endpoint ---
+
+@app.get("/api/metrics")
+def get_metrics():
+    """Current pipeline load for this API worker: queued/active downloads and pool jobs."""
+    config = get_config()
+    return {
+        **pipeline_stats,
+        "download_slots": config.downloader.max_concurrent,
+        "pool_workers": config.whisper.workers,
+    }
+
 # --- Config Endpoint ---
 
 @app.get("/api/config")
@@ -206,8 +572,32 @@ def get_app_config():
 
 # --- Video Details Endpoint for Library Reuse ---
 
+def _etag_response(request: Request, payload: Any) -> Response:
+    """
+    Serialize a payload with a content ETag, answering 304 if the client already has it.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        payload: Plain JSON data; datetimes are allowed
+        
+    Returns:
+        A JSON response, or an empty 304 when the ETag matches
+    """
+    response = APIJSONResponse(payload)
+    etag = '"' + hashlib.blake2b(response.body, digest_size=16).hexdigest() + '"'
+    # no-cache still stores the body but makes the browser revalidate with the ETag
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    # Gzip may weaken the tag on the way back, so ignore the W/ prefix
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
 @app.get("/api/videos/{video_id}")
 def get_video_details(
+    request: Request,
     video_id: int,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
@@ -230,7 +620,7 @@ def get_video_details(
         except:
             pass
     
-    return {
+    return _etag_response(request, {
         "id": video.id,
         "title": video.title,
         "filename": video.filename,
@@ -249,7 +639,7 @@ def get_video_details(
             "clips": video.clips_data,
             "extracted_files": video.clips_paths
         } if video.clips_data else None
-    }
+    })
 
 # --- API Models ---
 
@@ -258,6 +648,14 @@ class TranscribeRequest(BaseModel):
     language: Optional[str] = None
     model: Optional[str] = None
     device: Optional[str] = "auto"
+    compute_type: Optional[str] = None  # Whisper precision, see COMPUTE_TYPES
+
+class TranscribeBatchRequest(BaseModel):
+    urls: List[str]
+    language: Optional[str] = None
+    model: Optional[str] = None
+    device: Optional[str] = "auto"
+    compute_type: Optional[str] = None  # Whisper precision, see COMPUTE_TYPES
 
 class SummarizeRequest(BaseModel):
     transcript_text: Optional[str] = None # Prefer passing text directly now
@@ -270,6 +668,7 @@ class SummarizeRequest(BaseModel):
 class ChatStartRequest(BaseModel):
     transcript_text: Optional[str] = None
     transcript_path: Optional[str] = None
+    video_id: Optional[int] = None  # Use the library transcript when no text/path is sent
     provider: Optional[str] = "google"
     model: Optional[str] = None
 
@@ -277,6 +676,18 @@ class ChatMessageRequest(BaseModel):
     session_id: str
     message: str
 
+class JobStatusResponse(BaseModel):
+    id: str
+    type: Optional[str] = None
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+class JobResultResponse(BaseModel):
+    id: str
+    result: Optional[Dict[str, Any]] = None
+
 class ExtractClipsRequest(BaseModel):
     transcript_path: Optional[str] = None
     transcript_text: Optional[str] = None  # Allow passing text directly
@@ -287,27 +698,189 @@ class ExtractClipsRequest(BaseModel):
     provider: str = "google"
     model: Optional[str] = None
 
+def resolve_artifact(path: str) -> Path:
+    """Resolve a client-supplied path, rejecting anything outside the output directory."""
+    resolved = Path(path).resolve()
+    if OUTPUT_ROOT.resolve() not in resolved.parents:
+        raise HTTPException(status_code=400, detail="Invalid file path")
+    return resolved
+
+@lru_cache(maxsize=64)
+def _load_transcript_text(path: Path, mtime_ns: int) -> str:
+    if path.suffix == ".srt":
+        # Transcription jobs write the plain text next to the SRT
+        text_path = path.with_suffix(".txt")
+        if text_path.is_file():
+            return text_path.read_text(encoding="utf-8")
+        return srt_to_text(path)
+    return path.read_text(encoding="utf-8")
+
+def _read_transcript_text(path: Path) -> str:
+    """Read a transcript file as plain text, dropping SRT indices and timestamps."""
+    # Keyed on mtime so a rewritten transcript is never served stale
+    return _load_transcript_text(path, path.stat().st_mtime_ns)
+
+def _resolve_transcript(
+    db: Session,
+    user: models.User,
+    text: Optional[str],
+    path: Optional[str],
+    video_id: Optional[int] = None,
+    keep_timestamps: bool = False,
+) -> Optional[str]:
+    """
+    Find the transcript for a request: inline text, then the file, then the library.
+    
+    Args:
+        db: Database session used for the video lookup
+        user: Requesting user; only their own library videos are used
+        text: Transcript text sent with the request
+        path: Transcript file under output/
+        video_id: Library video whose stored transcript can be used
+        keep_timestamps: Return the raw SRT instead of plain text
+        
+    Returns:
+        The transcript, or None if no source had one
+    """
+    if text:
+        return text
+    if path:
+        transcript_path = resolve_artifact(path)
+        if transcript_path.is_file():
+            if keep_timestamps:
+                return transcript_path.read_text(encoding="utf-8")
+            return _read_transcript_text(transcript_path)
+    if video_id is not None:
+        video = db.query(models.Video).filter(
+            models.Video.id == video_id,
+            models.Video.user_id == user.id
+        ).first()
+        if video is not None:
+            if not keep_timestamps:
+                return video.transcript_text
+            if video.transcript_path:
+                # The library keeps the plain text; the SRT sits next to it
+                srt_path = Path(video.transcript_path).with_suffix(".srt")
+                if srt_path.is_file():
+                    return srt_path.read_text(encoding="utf-8")
+    return None
+
 # --- Protected Endpoints ---
 
 @app.get("/api/library")
-def get_library(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(get_db)):
-    return db.query(models.Video).filter(models.Video.user_id == current_user.id).all()
+def get_library(request: Request, current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(get_db)):
+    videos = db.query(models.Video).filter(models.Video.user_id == current_user.id).all()
+    # Plain column dicts serialize in one pass, without jsonable_encoder walking each ORM object
+    columns = models.Video.__table__.columns.keys()
+    return _etag_response(request, [{key: getattr(video, key) for key in columns} for video in videos])
 
-@app.get("/api/jobs/{job_id}")
-def get_job_status(job_id: str, db: Session = Depends(get_db)):
-    # Making this public-ish or we can verify user ownership if we link job->video->user
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+def _job_to_dict(job: models.Job, include_result: bool = True) -> dict:
     return {
         "id": job.id,
         "type": job.type,
         "status": job.status,
-        "result": job.result,
+        "result": job.result if include_result else None,
         "error": job.error,
         "updated_at": job.updated_at
     }
 
+def _load_job_state(job_id: str) -> Optional[dict]:
+    db = database.SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        return _job_to_dict(job) if job else None
+    finally:
+        db.close()
+
+# Everything but the result JSON, which holds the full transcript once a job completes
+JOB_STATUS_COLUMNS = load_only(
+    models.Job.id, models.Job.type, models.Job.status, models.Job.error, models.Job.updated_at
+)
+
+# Progress steps are written by worker processes, so re-read at this interval between completion wake-ups
+JOB_EVENTS_REFRESH_SECONDS = 1.0
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job_status(job_id: str, include_result: bool = True, db: Session = Depends(get_db)):
+    """Get a job's status; pass include_result=false to skip loading the (possibly large) result."""
+    # Making this public-ish or we can verify user ownership if we link job->video->user
+    options = [] if include_result else [JOB_STATUS_COLUMNS]
+    job = db.get(models.Job, job_id, options=options)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_to_dict(job, include_result=include_result)
+
+@app.get("/api/jobs/{job_id}/result", response_model=JobResultResponse)
+def get_job_result(job_id: str, db: Session = Depends(get_db)):
+    """Get only a job's result payload."""
+    job = db.get(models.Job, job_id, options=[load_only(models.Job.id, models.Job.result)])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"id": job.id, "result": job.result}
+
+async def _watch_job(job_id: str, state: dict, is_disconnected=None):
+    """
+    Yield each distinct job state, starting with the given one, until the job ends.
+    
+    Args:
+        job_id: Job to watch
+        state: Its current state, as loaded by _load_job_state
+        is_disconnected: Optional coroutine function; watching stops once it
+            returns True, so a closed stream doesn't keep polling the database
+    """
+    last = None
+    while True:
+        if state != last:
+            yield state
+            last = state
+        if state["status"] in (JobStatus.COMPLETED, JobStatus.FAILED):
+            break
+        event = job_events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=JOB_EVENTS_REFRESH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        if is_disconnected is not None and await is_disconnected():
+            break
+        state = await asyncio.to_thread(_load_job_state, job_id)
+        if state is None:
+            break
+    job_events.pop(job_id, None)
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_status_events(request: Request, job_id: str):
+    """Stream job status updates as Server-Sent Events until the job completes or fails."""
+    state = await asyncio.to_thread(_load_job_state, job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def generate():
+        # Updates are only sent on change, so a disconnect has to be polled for
+        async for update in _watch_job(job_id, state, request.is_disconnected):
+            yield f"data: {json.dumps(update, default=str)}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/api/jobs/{job_id}/ws")
+async def job_status_ws(websocket: WebSocket, job_id: str):
+    """Push job status updates over a WebSocket until the job completes or fails."""
+    state = await asyncio.to_thread(_load_job_state, job_id)
+    if state is None:
+        await websocket.close(code=4404)
+        return
+    
+    await websocket.accept()
+    try:
+        async for update in _watch_job(job_id, state):
+            await websocket.send_text(json.dumps(update, default=str))
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
+
 @app.post("/api/transcribe/url")
 def transcribe_url(
     request: TranscribeRequest, 
@@ -315,52 +888,103 @@ def transcribe_url(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    job_id = str(uuid.uuid4())
-    new_job = models.Job(id=job_id, type="transcribe", status=JobStatus.PENDING)
-    db.add(new_job)
-    db.commit()
+    _check_compute_type(request.compute_type)
+    job_id = create_job(db, "transcribe")
     
     background_tasks.add_task(
-        process_transcription, 
+        run_url_job,
         job_id, 
         request.url, 
         request.model, 
         request.language, 
         request.device,
-        current_user.id
+        current_user.id,
+        request.compute_type
     )
     return {"job_id": job_id, "status": "pending"}
 
+@app.post("/api/transcribe/batch")
+def transcribe_batch(
+    request: TranscribeBatchRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Queue one transcription job per URL; the worker pool overlaps their downloads and transcriptions."""
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="At least one URL required")
+    _check_compute_type(request.compute_type)
+    
+    job_ids = [create_job(db, "transcribe") for _ in request.urls]
+    # Background tasks run one after another, so start the whole batch from a single task
+    background_tasks.add_task(
+        run_url_jobs,
+        list(zip(job_ids, request.urls)),
+        request.model,
+        request.language,
+        request.device,
+        current_user.id,
+        request.compute_type
+    )
+    return {"job_ids": job_ids, "status": "pending"}
+
+# Large copy chunks keep syscalls per multi-GB upload low
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+def _save_upload(src: BinaryIO, dst: Path) -> None:
+    """
+    Copy an uploaded file into place.
+    
+    The multipart parser has already spooled the upload to a temp file, so
+    on Linux the bytes are copied by the kernel with copy_file_range and
+    never pass through Python; elsewhere this falls back to a buffered copy.
+    
+    Args:
+        src: The upload's file object, positioned at the start of the data
+        dst: Destination path
+    """
+    with open(dst, "wb") as out:
+        copy_range = getattr(os, "copy_file_range", None)
+        if copy_range is not None:
+            try:
+                src_fd, out_fd, offset = src.fileno(), out.fileno(), src.tell()
+                while copied := copy_range(src_fd, out_fd, UPLOAD_CHUNK_SIZE * 64, offset):
+                    offset += copied
+                return
+            except OSError:
+                # Unsupported file pair (e.g. old kernel across filesystems); start over buffered
+                out.seek(0)
+                out.truncate()
+        shutil.copyfileobj(src, out, UPLOAD_CHUNK_SIZE)
+
 @app.post("/api/transcribe/file")
-def transcribe_file(
+async def transcribe_file(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
     model: Optional[str] = Form(None),
     device: Optional[str] = Form("auto"),
+    compute_type: Optional[str] = Form(None),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    job_id = str(uuid.uuid4())
-    new_job = models.Job(id=job_id, type="transcribe", status=JobStatus.PENDING)
-    db.add(new_job)
-    db.commit()
-    
-    job_dir = Path(f"output/{job_id}")
-    job_dir.mkdir(parents=True, exist_ok=True)
+    _check_compute_type(compute_type)
+    loop = asyncio.get_running_loop()
+    job_id = await loop.run_in_executor(app.state.disk_pool, create_job, db, "transcribe")
     
-    file_path = job_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    file_path = job_output_dir(job_id) / Path(file.filename).name
+    await loop.run_in_executor(app.state.disk_pool, _save_upload, file.file, file_path)
         
     background_tasks.add_task(
-        process_transcription, 
+        run_job,
         job_id, 
+        process_transcription, 
         str(file_path), 
         model, 
         language, 
         device,
-        current_user.id
+        current_user.id,
+        compute_type
     )
     return {"job_id": job_id, "status": "pending"}
 
@@ -370,6 +994,7 @@ class TranscribeExistingRequest(BaseModel):
     language: Optional[str] = None
     model: Optional[str] = None
     device: Optional[str] = "auto"
+    compute_type: Optional[str] = None  # Whisper precision, see COMPUTE_TYPES
 
 
 @app.post("/api/transcribe/existing")
@@ -380,48 +1005,49 @@ def transcribe_existing(
     current_user: models.User = Depends(auth.get_current_user)
 ):
     """Transcribe an existing video file from the library (fresh transcription with new settings)."""
-    # Verify file exists
-    if not os.path.exists(request.file_path):
-        raise HTTPException(status_code=404, detail="Video file not found")
-    
     # Security check - only allow files from output directory
-    if not request.file_path.startswith("output/"):
-        raise HTTPException(status_code=400, detail="Invalid file path")
+    file_path = resolve_artifact(request.file_path)
+    if not file_path.is_file():
+        raise HTTPException(status_code=404, detail="Video file not found")
+    _check_compute_type(request.compute_type)
     
-    job_id = str(uuid.uuid4())
-    new_job = models.Job(id=job_id, type="transcribe", status=JobStatus.PENDING)
-    db.add(new_job)
-    db.commit()
+    job_id = create_job(db, "transcribe")
     
     print(f"[Transcribe Existing] Starting fresh transcription of: {request.file_path}")
     print(f"[Transcribe Existing] Language: {request.language}, Job ID: {job_id}")
     
     background_tasks.add_task(
-        process_transcription, 
+        run_job,
         job_id, 
+        process_transcription, 
         request.file_path, 
         request.model, 
         request.language, 
         request.device,
-        current_user.id
+        current_user.id,
+        request.compute_type
     )
     return {"job_id": job_id, "status": "pending"}
 
 # --- Summarize, Chat, Clips (Basic Implementation without DB Persistence for now) ---
 # For this iteration, we keep them simple, but they should really be Jobs too.
 
+# Summaries keyed by transcript digest and generation settings
+SUMMARY_CACHE_TTL_SECONDS = 86400
+summary_cache = TTLCache(maxsize=256, ttl=SUMMARY_CACHE_TTL_SECONDS)
+
+def _summary_cache_key(text: str, output_language: str, provider: str, model: Optional[str]) -> tuple:
+    return (hashlib.sha256(text.encode("utf-8")).hexdigest(), output_language, provider, model)
+
 @app.post("/api/summarize")
 def summarize_endpoint(
     request: SummarizeRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
 ):
     """Generate a summary from transcript text and optionally save to video record."""
     try:
-        text = request.transcript_text
-        if not text and request.transcript_path:
-             if os.path.exists(request.transcript_path):
-                 with open(request.transcript_path, "r", encoding="utf-8") as f:
-                     text = f.read()
+        text = _resolve_transcript(db, current_user, request.transcript_text, request.transcript_path, request.video_id)
         
         if not text:
              raise HTTPException(status_code=400, detail="Transcript text required")
@@ -429,12 +1055,21 @@ def summarize_endpoint(
         print(f"[Summarize] Provider: {request.provider}, Model: {request.model}, Language: {request.output_language}")
         print(f"[Summarize] Transcript length: {len(text)} chars, Video ID: {request.video_id}")
         
-        summarizer = VideoSummarizer(provider=request.provider, model=request.model)
-        summary = summarizer.summarize(text, output_language=request.output_language)
+        cache_key = _summary_cache_key(text, request.output_language, request.provider, request.model)
+        summary = summary_cache.get(cache_key)
+        if summary is None:
+            summarizer = get_summarizer(request.provider, request.model)
+            summary = summarizer.summarize(text, output_language=request.output_language)
+            summary_cache[cache_key] = summary
+        else:
+            print("[Summarize] Served from cache")
         
         # Persist to database if video_id provided
         if request.video_id:
-            video = db.query(models.Video).filter(models.Video.id == request.video_id).first()
+            video = db.query(models.Video).filter(
+                models.Video.id == request.video_id,
+                models.Video.user_id == current_user.id
+            ).first()
             if video:
                 video.summary_text = summary.text
                 video.summary_key_points = summary.key_points
@@ -448,25 +1083,83 @@ def summarize_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         print(f"[Summarize ERROR] {type(e).__name__}: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"{type(e).__name__}: {str(e)}")
 
-# Chat Sessions (In-memory is fine for transient chat)
-chat_sessions: Dict[str, Any] = {}
+# Chat Sessions: the chats table is the source of truth so any worker can serve
+# any session and restarts don't lose them; live ChatSession objects (transcript
+# prompt + LLM client) are cached per process and rebuilt on a miss
+CHAT_SESSION_TTL_SECONDS = 3600
+CHAT_SESSION_MAX = 1000
+chat_sessions = TTLCache(maxsize=CHAT_SESSION_MAX, ttl=CHAT_SESSION_TTL_SECONDS)
+
+def _chat_expiry_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=CHAT_SESSION_TTL_SECONDS)
+
+def _new_chat_session(transcript: str, provider: Optional[str], model: Optional[str]) -> ChatSession:
+    session = ChatSession(transcript=transcript, client=get_summarizer(provider, model).client)
+    # Per-request copies then share the rendered prompt
+    session.prepare()
+    return session
+
+def _load_chat_session(session_id: str) -> Optional[ChatSession]:
+    """Get a live chat session with its latest history, or None if unknown or expired."""
+    db = database.SessionLocal()
+    try:
+        # History is small, so always read it; another worker may have answered last
+        row = db.query(models.Chat.history, models.Chat.updated_at).filter(models.Chat.id == session_id).first()
+        if row is None or row.updated_at < _chat_expiry_cutoff():
+            return None
+        
+        cached = chat_sessions.get(session_id)
+        if cached is None:
+            chat = db.get(models.Chat, session_id)
+            cached = _new_chat_session(chat.transcript, chat.provider, chat.model)
+            chat_sessions[session_id] = cached
+        # Each request gets its own copy, so concurrent messages to one session
+        # don't append to a shared history; the prompt and client stay shared
+        session = copy.copy(cached)
+        session.history = [ChatMessage(**message) for message in row.history or []]
+        return session
+    finally:
+        db.close()
+
+def _save_chat_history(session_id: str, history: List[dict]):
+    db = database.SessionLocal()
+    try:
+        db.query(models.Chat).filter(models.Chat.id == session_id).update(
+            {"history": history, "updated_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def purge_expired_chats() -> int:
+    """Delete chat sessions idle for longer than CHAT_SESSION_TTL_SECONDS."""
+    db = database.SessionLocal()
+    try:
+        count = db.query(models.Chat).filter(models.Chat.updated_at < _chat_expiry_cutoff()).delete(synchronize_session=False)
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+# Comment frames keep proxies from closing the stream while the LLM is thinking
+CHAT_KEEPALIVE_SECONDS = 15.0
 
 @app.post("/api/chat/start")
-def start_chat(request: ChatStartRequest):
+def start_chat(
+    request: ChatStartRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
     """Start a new chat session about a video transcript."""
-    session_id = str(uuid.uuid4())
+    session_id = sortable_id()
     
     # Get transcript text - try text first, then fall back to file path
-    text = request.transcript_text
-    if not text and request.transcript_path:
-        if os.path.exists(request.transcript_path):
-            with open(request.transcript_path, "r", encoding="utf-8") as f:
-                text = f.read()
+    text = _resolve_transcript(db, current_user, request.transcript_text, request.transcript_path, request.video_id)
     
     if not text:
         raise HTTPException(status_code=400, detail="Transcript text or path required")
@@ -474,47 +1167,75 @@ def start_chat(request: ChatStartRequest):
     print(f"[Chat Start] Provider: {request.provider}, Model: {request.model}")
     print(f"[Chat Start] Transcript length: {len(text)} chars")
     
-    session = create_chat_session(transcript=text, provider=request.provider, model=request.model)
-    chat_sessions[session_id] = session
+    db.add(models.Chat(id=session_id, transcript=text, provider=request.provider, model=request.model, history=[]))
+    db.commit()
+    
+    chat_sessions[session_id] = _new_chat_session(text, request.provider, request.model)
     return {"session_id": session_id}
 
 @app.post("/api/chat/message")
 def chat_message(request: ChatMessageRequest):
-    session = chat_sessions.get(request.session_id)
+    session = _load_chat_session(request.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
         
     async def generate():
-        for token in session.chat_stream(request.message):
-            yield token
+        # The LLM client streams synchronously, so pull tokens from a worker thread
+        tokens = iterate_in_threadpool(session.chat_stream(request.message))
+        next_token = asyncio.ensure_future(tokens.__anext__())
+        try:
+            while True:
+                done, _ = await asyncio.wait({next_token}, timeout=CHAT_KEEPALIVE_SECONDS)
+                if not done:
+                    yield ": keep-alive\n\n"
+                    continue
+                try:
+                    token = next_token.result()
+                except StopAsyncIteration:
+                    await asyncio.to_thread(_save_chat_history, request.session_id, session.get_history())
+                    break
+                except Exception as e:
+                    print(f"[Chat ERROR] {type(e).__name__}: {e}")
+                    yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+                    break
+                # JSON-encode so newlines inside a token don't break SSE framing
+                yield f"data: {json.dumps(token)}\n\n"
+                next_token = asyncio.ensure_future(tokens.__anext__())
+        finally:
+            next_token.cancel()
     
-    return StreamingResponse(generate(), media_type="text/plain")
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.post("/api/extract-clips")
 def extract_clips_endpoint(
     request: ExtractClipsRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user)
 ):
     """Extract important clips from a video based on transcript and optionally save to video record."""
     try:
         # Get transcript text
-        text = request.transcript_text
-        if not text and request.transcript_path:
-            if os.path.exists(request.transcript_path):
-                with open(request.transcript_path, "r", encoding="utf-8") as f:
-                    text = f.read()
+        # Keep SRT timestamps here, the LLM needs them to place clips
+        text = _resolve_transcript(
+            db, current_user, request.transcript_text, request.transcript_path, request.video_id,
+            keep_timestamps=True
+        )
         
         if not text:
             raise HTTPException(status_code=400, detail="Transcript text or path required")
         
-        if not os.path.exists(request.video_path):
+        if not resolve_artifact(request.video_path).is_file():
             raise HTTPException(status_code=400, detail=f"Video file not found: {request.video_path}")
         
         print(f"[Extract Clips] Provider: {request.provider}, Model: {request.model}, Num clips: {request.num_clips}")
         print(f"[Extract Clips] Transcript length: {len(text)} chars, Video: {request.video_path}, Video ID: {request.video_id}")
         
         # Use VideoSummarizer to extract clips
-        summarizer = VideoSummarizer(provider=request.provider, model=request.model)
+        summarizer = get_summarizer(request.provider, request.model)
         clips = summarizer.extract_clips(text, num_clips=request.num_clips)
         
         # Convert clips to serializable format - use Clip model's to_dict()
@@ -523,8 +1244,7 @@ def extract_clips_endpoint(
         # Optionally extract and merge actual video clips
         output_clips = []
         if clips_data:
-            from pathlib import Path
-            output_dir = Path("output") / "clips" / str(uuid.uuid4())[:8]
+            output_dir = OUTPUT_ROOT / "clips" / token_hex(4)
             output_dir.mkdir(parents=True, exist_ok=True)
             
             try:
@@ -542,7 +1262,10 @@ def extract_clips_endpoint(
         
         # Persist to database if video_id provided
         if request.video_id:
-            video = db.query(models.Video).filter(models.Video.id == request.video_id).first()
+            video = db.query(models.Video).filter(
+                models.Video.id == request.video_id,
+                models.Video.user_id == current_user.id
+            ).first()
             if video:
                 video.clips_data = clips_data
                 video.clips_paths = output_clips
@@ -558,7 +1281,6 @@ def extract_clips_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         print(f"[Extract Clips ERROR] {type(e).__name__}: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"{type(e).__name__}: {str(e)}")
@@ -568,15 +1290,13 @@ def extract_clips_endpoint(
 def download_clip(path: str):
     """Download a clip file."""
     # Security check - only allow files from output directory
-    if not path.startswith("output/"):
-        raise HTTPException(status_code=400, detail="Invalid clip path")
-    
-    if not os.path.exists(path):
+    clip_path = resolve_artifact(path)
+    if not clip_path.is_file():
         raise HTTPException(status_code=404, detail="Clip file not found")
     
-    filename = os.path.basename(path)
+    filename = clip_path.name
     return FileResponse(
-        path,
+        clip_path,
         media_type="video/mp4",
         filename=filename,
         headers={"Content-Disposition": f"attachment; filename={filename}"}
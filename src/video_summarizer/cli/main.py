@@ -9,15 +9,46 @@ Provides commands for:
 """
 
 import json
-import os
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import click
 
-from video_summarizer.config import get_config
+
+# yt-dlp format for downloads that are only transcribed, never clipped
+AUDIO_ONLY_FORMAT = "bestaudio[ext=m4a]/bestaudio/best"
+
+
+def _response_cache(no_cache: bool):
+    """Get the LLM response cache unless the user opted out."""
+    from video_summarizer.llm.cache import get_response_cache
+    
+    return None if no_cache else get_response_cache()
+
+
+def _format_summary(summary) -> str:
+    """Render a summary and its numbered key points as the summary.txt text."""
+    points = "".join([f"{i}. {point}\n" for i, point in enumerate(summary.key_points, 1)])
+    return f"{summary.text}\n\n---\n\nKey Points:\n{points}"
+
+
+def _transcribe_with_progress(transcriber, audio, language: Optional[str], batch_size: Optional[int]) -> list:
+    """Transcribe audio, showing how far decoding has got as segments arrive."""
+    duration = len(audio) / 16000  # extract_audio_array yields 16 kHz samples
+    segments = []
+    shown = -1
+    for segment in transcriber.transcribe_streaming(audio, language=language, batch_size=batch_size):
+        segments.append(segment)
+        percent = int(min(segment.end / duration, 1.0) * 100) if duration else 0
+        if percent != shown:
+            click.echo(f"\r   {percent:3d}% ({len(segments)} segments)", nl=False)
+            shown = percent
+    if shown >= 0:
+        click.echo()
+    return segments
 
 
 @click.group()
@@ -50,7 +81,20 @@ def cli():
     type=click.Choice(["auto", "cpu", "cuda"]),
     help="Device to use for transcription. Defaults to 'auto' (tries CUDA, falls back to CPU).",
 )
-def transcribe(source: str, output: Optional[str], language: Optional[str], model: Optional[str], device: Optional[str]):
+@click.option(
+    "--batch-size", "-b",
+    default=None,
+    type=click.IntRange(min=1),
+    help="VAD chunks decoded per Whisper pass; 1 disables batching. Defaults to config value (WHISPER_BATCH_SIZE).",
+)
+def transcribe(
+    source: str,
+    output: Optional[str],
+    language: Optional[str],
+    model: Optional[str],
+    device: Optional[str],
+    batch_size: Optional[int],
+):
     """
     Transcribe a video to SRT format.
     
@@ -59,8 +103,8 @@ def transcribe(source: str, output: Optional[str], language: Optional[str], mode
     from video_summarizer.transcription import (
         is_youtube_url,
         download_video,
-        extract_audio,
-        WhisperTranscriber,
+        extract_audio_array,
+        get_transcriber,
         save_srt,
     )
     
@@ -70,7 +114,8 @@ def transcribe(source: str, output: Optional[str], language: Optional[str], mode
     if is_youtube_url(source):
         click.echo("📥 Downloading from YouTube...")
         try:
-            video_path = download_video(source)
+            # Only the soundtrack is transcribed, so skip the (much larger) video stream
+            video_path = download_video(source, format_preference=AUDIO_ONLY_FORMAT)
             click.echo(f"✅ Downloaded to: {video_path}")
         except Exception as e:
             click.echo(f"❌ Download failed: {e}", err=True)
@@ -85,19 +130,23 @@ def transcribe(source: str, output: Optional[str], language: Optional[str], mode
     if output is None:
         output = str(Path(video_path).with_suffix(".srt"))
     
-    # Extract audio
+    transcriber = get_transcriber(model=model, device=device)
+    
+    # Extract audio while the Whisper weights load in the background
     click.echo("🎵 Extracting audio...")
-    try:
-        audio_path = extract_audio(video_path)
-    except Exception as e:
-        click.echo(f"❌ Audio extraction failed: {e}", err=True)
-        sys.exit(1)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        model_loaded = executor.submit(transcriber.load_model)
+        try:
+            audio = extract_audio_array(video_path)
+        except Exception as e:
+            click.echo(f"❌ Audio extraction failed: {e}", err=True)
+            sys.exit(1)
     
     # Transcribe
     click.echo("📝 Transcribing (this may take a while)...")
     try:
-        transcriber = WhisperTranscriber(model=model, language=language, device=device)
-        segments = transcriber.transcribe(audio_path)
+        model_loaded.result()
+        segments = _transcribe_with_progress(transcriber, audio, language, batch_size)
         click.echo(f"✅ Transcribed {len(segments)} segments")
     except Exception as e:
         click.echo(f"❌ Transcription failed: {e}", err=True)
@@ -106,12 +155,6 @@ def transcribe(source: str, output: Optional[str], language: Optional[str], mode
     # Save SRT
     save_srt(segments, output)
     click.echo(f"💾 Saved to: {output}")
-    
-    # Cleanup temp audio
-    try:
-        os.unlink(audio_path)
-    except:
-        pass
 
 
 @cli.command()
@@ -138,13 +181,27 @@ def transcribe(source: str, output: Optional[str], language: Optional[str], mode
     type=click.Choice(["original", "english"]),
     help="Summary output language: 'original' (video language) or 'english'.",
 )
-def summarize(transcript_path: str, output: Optional[str], provider: Optional[str], model: Optional[str], output_language: str):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Always query the LLM instead of reusing cached responses for identical requests.",
+)
+def summarize(
+    transcript_path: str,
+    output: Optional[str],
+    provider: Optional[str],
+    model: Optional[str],
+    output_language: str,
+    no_cache: bool,
+):
     """
     Summarize a video transcript.
     
     TRANSCRIPT_PATH should be a path to an SRT file.
     """
-    from video_summarizer.transcription.srt_formatter import load_srt
+    from video_summarizer.transcription.srt_formatter import srt_to_text
+    from video_summarizer.utils import atomic_write
     from video_summarizer.llm import VideoSummarizer
     
     # Load transcript
@@ -155,9 +212,8 @@ def summarize(transcript_path: str, output: Optional[str], provider: Optional[st
     click.echo(f"📖 Loading transcript: {transcript_path}")
     
     try:
-        segments = load_srt(transcript_path)
         # Combine all text for summarization
-        transcript_text = "\n".join(seg.text for seg in segments)
+        transcript_text = srt_to_text(transcript_path)
     except Exception as e:
         click.echo(f"❌ Failed to load transcript: {e}", err=True)
         sys.exit(1)
@@ -169,18 +225,14 @@ def summarize(transcript_path: str, output: Optional[str], provider: Optional[st
     # Summarize
     click.echo(f"🤖 Generating summary (language: {output_language})...")
     try:
-        summarizer = VideoSummarizer(provider=provider, model=model)
+        summarizer = VideoSummarizer(provider=provider, model=model, cache=_response_cache(no_cache))
         summary = summarizer.summarize(transcript_text, output_language=output_language)
     except Exception as e:
         click.echo(f"❌ Summarization failed: {e}", err=True)
         sys.exit(1)
     
     # Save summary
-    with open(output, "w", encoding="utf-8") as f:
-        f.write(summary.text)
-        f.write("\n\n---\n\nKey Points:\n")
-        for i, point in enumerate(summary.key_points, 1):
-            f.write(f"{i}. {point}\n")
+    atomic_write(output, _format_summary(summary))
     
     click.echo(f"💾 Saved to: {output}")
     click.echo(f"\n📋 Summary:\n{summary.text[:500]}...")
@@ -225,6 +277,12 @@ def summarize(transcript_path: str, output: Optional[str], provider: Optional[st
     default=False,
     help="Merge all clips into a single video file.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Always query the LLM instead of reusing cached responses for identical requests.",
+)
 def extract_clips_cmd(
     transcript_path: str,
     video: str,
@@ -234,6 +292,7 @@ def extract_clips_cmd(
     model: Optional[str],
     reencode: bool,
     merge: bool,
+    no_cache: bool,
 ):
     """
     Extract important clips from a video based on its transcript.
@@ -270,7 +329,7 @@ def extract_clips_cmd(
     # Extract clips using LLM
     click.echo(f"🤖 Identifying {num_clips} best clips...")
     try:
-        summarizer = VideoSummarizer(provider=provider, model=model)
+        summarizer = VideoSummarizer(provider=provider, model=model, cache=_response_cache(no_cache))
         clips = summarizer.extract_clips(srt_content, num_clips=num_clips)
     except Exception as e:
         click.echo(f"❌ Clip extraction failed: {e}", err=True)
@@ -302,7 +361,7 @@ def extract_clips_cmd(
         click.echo("🔗 Merging clips into single video...")
         try:
             merged_path = str(Path(output_dir) / "merged_clips.mp4")
-            merge_clips(extracted, merged_path, reencode=True)
+            merge_clips(extracted, merged_path)
             click.echo(f"✅ Merged video saved to: {merged_path}")
         except Exception as e:
             click.echo(f"⚠️ Merge failed: {e}", err=True)
@@ -331,6 +390,12 @@ def extract_clips_cmd(
     default=None,
     help="Whisper model to use. Defaults to config value.",
 )
+@click.option(
+    "--batch-size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="VAD chunks decoded per Whisper pass; 1 disables batching. Defaults to config value (WHISPER_BATCH_SIZE).",
+)
 @click.option(
     "--provider", "-p",
     default=None,
@@ -358,17 +423,25 @@ def extract_clips_cmd(
     default=False,
     help="Merge all clips into a single video file.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Always query the LLM instead of reusing cached responses for identical requests.",
+)
 def process(
     source: str,
     output_dir: Optional[str],
     num_clips: int,
     language: Optional[str],
     whisper_model: Optional[str],
+    batch_size: Optional[int],
     provider: Optional[str],
     llm_model: Optional[str],
     output_language: str,
     reencode: bool,
     merge: bool,
+    no_cache: bool,
 ):
     """
     Process a video through the full pipeline.
@@ -384,12 +457,12 @@ def process(
     from video_summarizer.transcription import (
         is_youtube_url,
         download_video,
-        extract_audio,
-        WhisperTranscriber,
-        save_srt,
+        extract_audio_array,
+        get_transcriber,
         format_as_srt,
     )
     from video_summarizer.transcription.srt_formatter import load_srt
+    from video_summarizer.utils import atomic_write
     from video_summarizer.llm import VideoSummarizer
     from video_summarizer.llm.clip_extractor import extract_clips, save_clips_metadata, merge_clips
     
@@ -424,23 +497,21 @@ def process(
     transcript_path = output_dir / "transcript.srt"
     
     try:
-        audio_path = extract_audio(video_path)
-        transcriber = WhisperTranscriber(model=whisper_model, language=language)
-        segments = transcriber.transcribe(audio_path)
-        save_srt(segments, transcript_path)
+        transcriber = get_transcriber(model=whisper_model)
+        # Extract audio while the Whisper weights load in the background
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            model_loaded = executor.submit(transcriber.load_model)
+            audio = extract_audio_array(video_path)
+            model_loaded.result()
+        segments = _transcribe_with_progress(transcriber, audio, language, batch_size)
+        # Format once; the same SRT text is saved and sent to the LLM for clips
+        srt_content = format_as_srt(segments)
+        atomic_write(transcript_path, srt_content)
         click.echo(f"✅ Transcribed {len(segments)} segments")
-        
-        # Cleanup temp audio
-        try:
-            os.unlink(audio_path)
-        except:
-            pass
     except Exception as e:
         click.echo(f"❌ Transcription failed: {e}", err=True)
         sys.exit(1)
     
-    # Prepare transcript content
-    srt_content = format_as_srt(segments)
     plain_text = "\n".join(seg.text for seg in segments)
     
     # Step 3: Summarize
@@ -448,26 +519,39 @@ def process(
     summary_path = output_dir / "summary.txt"
     
     try:
-        summarizer = VideoSummarizer(provider=provider, model=llm_model)
-        summary = summarizer.summarize(plain_text, output_language=output_language)
-        
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(summary.text)
-            f.write("\n\n---\n\nKey Points:\n")
-            for i, point in enumerate(summary.key_points, 1):
-                f.write(f"{i}. {point}\n")
-        
-        click.echo(f"✅ Summary saved to: {summary_path}")
+        summarizer = VideoSummarizer(provider=provider, model=llm_model, cache=_response_cache(no_cache))
     except Exception as e:
         click.echo(f"❌ Summarization failed: {e}", err=True)
         sys.exit(1)
     
+    # Clip selection only needs the transcript, so its LLM request runs
+    # alongside the summary instead of waiting for it. The executor is closed
+    # before sys.exit, so a failed summary settles the clip request here
+    # rather than leaving a live worker for the interpreter to join.
+    with ThreadPoolExecutor(max_workers=1) as clip_executor:
+        clips_future = clip_executor.submit(summarizer.extract_clips, srt_content, num_clips=num_clips)
+        
+        try:
+            summary = summarizer.summarize(plain_text, output_language=output_language)
+            
+            atomic_write(summary_path, _format_summary(summary))
+            
+            click.echo(f"✅ Summary saved to: {summary_path}")
+            summary_error = None
+        except Exception as e:
+            clips_future.cancel()
+            summary_error = e
+    
+    if summary_error is not None:
+        click.echo(f"❌ Summarization failed: {summary_error}", err=True)
+        sys.exit(1)
+    
     # Step 4: Extract clips
     click.echo(f"\n✂️ Step 4/4: Extracting {num_clips} clips...")
     clips_dir = output_dir / "clips"
     
     try:
-        clips = summarizer.extract_clips(srt_content, num_clips=num_clips)
+        clips = clips_future.result()
         
         # Save metadata
         metadata_path = output_dir / "clips.json"
@@ -488,7 +572,7 @@ def process(
             click.echo("🔗 Merging clips into single video...")
             try:
                 merged_path = str(output_dir / "merged_clips.mp4")
-                merge_clips(extracted, merged_path, reencode=True)
+                merge_clips(extracted, merged_path)
                 click.echo(f"✅ Merged video saved to: {merged_path}")
             except Exception as e:
                 click.echo(f"⚠️ Merge failed: {e}", err=True)
@@ -531,7 +615,7 @@ def chat(transcript_path: str, provider: Optional[str], model: Optional[str]):
     Type 'quit', 'exit', or 'q' to end the session.
     Type 'clear' to reset conversation history.
     """
-    from video_summarizer.transcription.srt_formatter import load_srt
+    from video_summarizer.transcription.srt_formatter import srt_to_text
     from video_summarizer.llm import create_chat_session
     
     # Load transcript
@@ -542,8 +626,7 @@ def chat(transcript_path: str, provider: Optional[str], model: Optional[str]):
     click.echo(f"📖 Loading transcript: {transcript_path}")
     
     try:
-        segments = load_srt(transcript_path)
-        transcript_text = "\n".join(seg.text for seg in segments)
+        transcript_text = srt_to_text(transcript_path)
     except Exception as e:
         click.echo(f"❌ Failed to load transcript: {e}", err=True)
         sys.exit(1)
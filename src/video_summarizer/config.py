@@ -6,19 +6,18 @@ Loads settings from environment variables and provides defaults.
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional, Literal, List
 
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
 # Allowed languages for transcription (Arabic and English only)
 ALLOWED_LANGUAGES = {
     "ar": "Arabic",
     "en": "English"
 }
 
+# Whisper precisions selectable per request ("auto" picks per device)
+COMPUTE_TYPES = ("auto", "int8", "int8_float16", "float16", "float32")
+
 # Default LLM models if not specified in .env
 DEFAULT_LLM_MODELS = [
     "gemini-1.5-flash",
@@ -34,7 +33,14 @@ class WhisperConfig:
     model: str = "large-v3"
     language: str = field(default_factory=lambda: os.getenv("WHISPER_LANGUAGE", "ar"))
     device: str = field(default_factory=lambda: os.getenv("WHISPER_DEVICE", "auto"))
-    compute_type: str = field(default_factory=lambda: os.getenv("WHISPER_COMPUTE_TYPE", "float16"))
+    # "auto" picks int8 on CPU and float16 on GPU
+    compute_type: str = field(default_factory=lambda: os.getenv("WHISPER_COMPUTE_TYPE", "auto"))
+    # Chunks decoded together by the batched pipeline (1 disables batching)
+    batch_size: int = field(default_factory=lambda: int(os.getenv("WHISPER_BATCH_SIZE", "8")))
+    # Load the model in every worker at startup instead of on the first job
+    warmup: bool = field(default_factory=lambda: os.getenv("WHISPER_WARMUP", "false").lower() in ("1", "true", "yes"))
+    # Worker processes running transcription jobs, per API worker; each loads its own model copy
+    workers: int = field(default_factory=lambda: max(1, int(os.getenv("WHISPER_WORKERS", "1"))))
     
     def validate_language(self, lang: str) -> str:
         """Validate and return language code. Defaults to 'ar' if invalid."""
@@ -62,6 +68,9 @@ class LLMConfig:
     # Common settings
     max_tokens: int = field(default_factory=lambda: int(os.getenv("LLM_MAX_TOKENS", "8192")))
     temperature: float = field(default_factory=lambda: float(os.getenv("LLM_TEMPERATURE", "0.7")))
+    # Chat sends only the most relevant transcript excerpts when the transcript
+    # is longer than this many characters (0 always sends the full transcript)
+    chat_transcript_max_chars: int = field(default_factory=lambda: int(os.getenv("CHAT_TRANSCRIPT_MAX_CHARS", "0")))
     
     @property
     def api_key(self) -> str:
@@ -101,6 +110,24 @@ class DownloaderConfig:
     proxy: Optional[str] = field(default_factory=lambda: os.getenv("YOUTUBE_PROXY", os.getenv("HTTP_PROXY")))
     # Google Apps Script bridge URL for video validation (optional)
     gas_bridge_url: Optional[str] = field(default_factory=lambda: os.getenv("GAS_BRIDGE_URL"))
+    # Concurrent video downloads per API worker
+    max_concurrent: int = field(default_factory=lambda: int(os.getenv("DOWNLOAD_SLOTS", "8")))
+
+
+@dataclass
+class APIConfig:
+    """Configuration for the HTTP API server."""
+    
+    # Seconds browsers may cache a CORS preflight (Firefox honours up to 24h, Chrome 2h)
+    cors_max_age: int = field(default_factory=lambda: int(os.getenv("CORS_MAX_AGE", "86400")))
+    
+    @property
+    def cors_origins(self) -> List[str]:
+        """Get the browser origins allowed to call the API from environment ("*" allows any)."""
+        origins_str = os.getenv("CORS_ORIGINS", "")
+        if origins_str:
+            return [o.strip() for o in origins_str.split(",") if o.strip()]
+        return ["*"]
 
 
 @dataclass
@@ -111,6 +138,7 @@ class Config:
     llm: LLMConfig = field(default_factory=LLMConfig)
     output: OutputConfig = field(default_factory=OutputConfig)
     downloader: DownloaderConfig = field(default_factory=DownloaderConfig)
+    api: APIConfig = field(default_factory=APIConfig)
     
     def validate(self) -> list[str]:
         """Validate the configuration and return list of errors."""
@@ -124,6 +152,26 @@ class Config:
         return errors
 
 
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """
+    Load variables from the .env file into the environment, once per process.
+    
+    Deferred until settings are first needed, so commands that never read
+    them (e.g. --help) skip parsing the file.
+    """
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+
+
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get the current configuration."""
+    """
+    Get the configuration, built once per process.
+    
+    The environment is read on the first call only; call
+    get_config.cache_clear() after changing it (e.g. in tests).
+    """
+    load_env()
     return Config()
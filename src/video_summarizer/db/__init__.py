@@ -1,2 +1,2 @@
 from .database import Base, engine, get_db
-from .models import User, Video, Job
+from .models import User, Video, Job, Chat
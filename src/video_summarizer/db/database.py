@@ -1,11 +1,26 @@
-from sqlalchemy import create_engine
+from pydantic_core import from_json, to_json
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    # JSON columns (job results, clip data) go through pydantic-core's
+    # Rust encoder instead of the stdlib json module
+    json_serializer=lambda obj: to_json(obj).decode(),
+    json_deserializer=from_json,
 )
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    # WAL lets API readers poll job rows while worker processes write them
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -25,7 +25,7 @@ class Video(Base):
     
     # Metadata
     thumbnail_url = Column(String, nullable=True)
-    source_url = Column(String, nullable=True) # If from YouTube
+    source_url = Column(String, nullable=True, index=True) # If from YouTube
     
     # Transcript data for reuse
     transcript_text = Column(Text, nullable=True)
@@ -46,6 +46,10 @@ class Video(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Matches the reaper queries: status IN (...) AND updated_at < cutoff
+        Index("ix_jobs_status_updated_at", "status", "updated_at"),
+    )
 
     id = Column(String, primary_key=True, index=True) # UUID
     type = Column(String) # transcribe, summarize, extract
@@ -55,5 +59,16 @@ class Job(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
 
-    video_id = Column(Integer, ForeignKey("videos.id"), nullable=True)
+    video_id = Column(Integer, ForeignKey("videos.id"), nullable=True, index=True)
     video = relationship("Video", back_populates="jobs")
+
+class Chat(Base):
+    __tablename__ = "chats"
+
+    id = Column(String, primary_key=True, index=True)
+    transcript = Column(Text)
+    provider = Column(String, nullable=True)
+    model = Column(String, nullable=True)
+    history = Column(JSON, nullable=True) # [{"role": ..., "content": ...}]
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
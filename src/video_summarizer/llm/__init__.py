@@ -13,9 +13,11 @@ from video_summarizer.llm.client import (
     OpenRouterClient,
     GoogleAIClient,
     get_llm_client,
+    complete_many,
     LLMClientError,
 )
 from video_summarizer.llm.models import Clip, Summary
+from video_summarizer.llm.cache import ResponseCache
 from video_summarizer.llm.summarizer import VideoSummarizer
 from video_summarizer.llm.chat import ChatSession, create_chat_session
 from video_summarizer.llm.clip_extractor import merge_clips
@@ -24,9 +26,11 @@ __all__ = [
     "OpenRouterClient",
     "GoogleAIClient",
     "get_llm_client",
+    "complete_many",
     "LLMClientError",
     "Clip",
     "Summary",
+    "ResponseCache",
     "VideoSummarizer",
     "ChatSession",
     "create_chat_session",
@@ -0,0 +1,78 @@
+"""
+Disk cache for LLM JSON responses.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from video_summarizer.config import get_config
+from video_summarizer.utils import atomic_write
+
+
+# Cached responses older than this are treated as misses
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+class ResponseCache:
+    """
+    Cache of parsed LLM responses stored as JSON files.
+
+    Entries are keyed on the model and the full rendered prompts, so a
+    changed prompt template or a different transcript is always a miss and
+    no manual version bump is needed.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached responses.
+            ttl: Seconds an entry stays valid.
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(model: str, system: Optional[str], prompt: str, **params: Any) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model name the request is sent to.
+            system: System prompt.
+            prompt: User prompt.
+            **params: Other request parameters that change the response.
+
+        Returns:
+            Hex SHA-256 digest identifying the request.
+        """
+        payload = json.dumps(
+            {"model": model, "system": system, "prompt": prompt, "params": params},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for key, or None if missing or expired."""
+        path = self.directory / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, response: dict) -> None:
+        """Store a response under key."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.directory / f"{key}.json", json.dumps(response, ensure_ascii=False))
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the response cache under the configured output directory."""
+    return ResponseCache(Path(get_config().output.output_dir) / "cache" / "llm")
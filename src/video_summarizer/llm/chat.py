@@ -2,12 +2,23 @@
 Chat session management for video Q&A.
 """
 
+import hashlib
+import math
+import re
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 
+from video_summarizer.config import get_config
 from video_summarizer.llm.client import get_llm_client, LLMClient
 
 
+# Transcript lines are grouped into excerpts of about this many characters
+EXCERPT_CHARS = 2000
+
+_WORD_RE = re.compile(r"\w+")
+
+
 @dataclass
 class ChatMessage:
     """A single message in the chat history."""
@@ -28,30 +39,121 @@ class ChatSession:
     client: Optional[LLMClient] = None
     history: List[ChatMessage] = field(default_factory=list)
     max_history: int = 20  # Keep last N messages for context
+    # Above this transcript length only relevant excerpts are sent; 0 disables
+    max_transcript_chars: Optional[int] = None
+    
+    # Rendered once per transcript; re-rendered if the transcript is replaced
+    _prompt_for: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _system_prompt: str = field(default="", init=False, repr=False, compare=False)
+    _transcript_version: str = field(default="", init=False, repr=False, compare=False)
+    _excerpts: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _excerpt_terms: List[Counter] = field(default_factory=list, init=False, repr=False, compare=False)
+    _idf: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.client is None:
             self.client = get_llm_client()
+        if self.max_transcript_chars is None:
+            self.max_transcript_chars = get_config().llm.chat_transcript_max_chars
+    
+    def _refresh_prompt(self) -> None:
+        """Re-render the system prompt and version if the transcript changed."""
+        if self._prompt_for is self.transcript:
+            return
+        self._system_prompt = self._render_system_prompt(self.transcript)
+        self._transcript_version = hashlib.blake2b(
+            self.transcript.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        self._index_excerpts()
+        self._prompt_for = self.transcript
+    
+    def _over_budget(self) -> bool:
+        """Whether the transcript is too long to send in full."""
+        return bool(self.max_transcript_chars) and len(self.transcript) > self.max_transcript_chars
+    
+    def _index_excerpts(self) -> None:
+        """Split an over-budget transcript into excerpts and index their words."""
+        self._excerpts, self._excerpt_terms, self._idf = [], [], {}
+        if not self._over_budget():
+            return
+        
+        lines: List[str] = []
+        size = 0
+        for line in self.transcript.splitlines():
+            lines.append(line)
+            size += len(line) + 1
+            if size >= EXCERPT_CHARS:
+                self._excerpts.append("\n".join(lines))
+                lines, size = [], 0
+        if lines:
+            self._excerpts.append("\n".join(lines))
+        
+        self._excerpt_terms = [Counter(_WORD_RE.findall(e.lower())) for e in self._excerpts]
+        doc_freq = Counter(term for terms in self._excerpt_terms for term in terms)
+        n = len(self._excerpts)
+        self._idf = {term: math.log(1 + n / df) for term, df in doc_freq.items()}
+    
+    def _select_excerpts(self, message: str) -> str:
+        """Pick the excerpts that best match the message, within the budget."""
+        query = set(_WORD_RE.findall(message.lower()))
+        scores = [
+            sum(terms[t] * self._idf.get(t, 0.0) for t in query if t in terms)
+            for terms in self._excerpt_terms
+        ]
+        ranked = sorted(range(len(self._excerpts)), key=lambda i: scores[i], reverse=True)
+        
+        chosen, used = [], 0
+        for i in ranked:
+            if used + len(self._excerpts[i]) > self.max_transcript_chars and chosen:
+                break
+            chosen.append(i)
+            used += len(self._excerpts[i])
+        
+        # Keep the excerpts in video order so timestamps read naturally
+        return "\n...\n".join(self._excerpts[i] for i in sorted(chosen))
+    
+    def prepare(self) -> None:
+        """
+        Render the system prompt and excerpt index now instead of on the first message.
+        
+        Shallow copies of a prepared session share the rendered prompt, so
+        copies made per request don't each render it again.
+        """
+        self._refresh_prompt()
     
-    def _build_context(self) -> str:
-        """Build the full context including transcript and history."""
-        # Build conversation history string
-        history_str = ""
-        if self.history:
-            history_str = "\n\nPrevious conversation:\n"
-            for msg in self.history[-self.max_history:]:
-                role = "User" if msg.role == "user" else "Assistant"
-                history_str += f"{role}: {msg.content}\n"
+    @property
+    def transcript_version(self) -> str:
+        """Content hash of the transcript, usable as a prompt-cache or log key."""
+        self._refresh_prompt()
+        return self._transcript_version
+    
+    def _get_system_prompt(self, message: Optional[str] = None) -> str:
+        """
+        Get the system prompt with transcript context.
         
-        return history_str
+        The full-transcript prompt is rendered once and stays identical
+        across turns, so providers can cache it. Over-budget transcripts get
+        a per-question prompt holding only the most relevant excerpts.
+        """
+        self._refresh_prompt()
+        if message is not None and self._over_budget():
+            return self._render_system_prompt(
+                self._select_excerpts(message),
+                heading="Here are the parts of the video transcript most relevant to the question:",
+            )
+        return self._system_prompt
     
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt with transcript context."""
+    def _render_system_prompt(
+        self,
+        transcript: str,
+        heading: str = "Here is the video transcript:",
+    ) -> str:
+        """Render the system prompt around a transcript or transcript excerpts."""
         return f"""You are a helpful assistant that answers questions about a video based on its transcript.
 
-Here is the video transcript:
+{heading}
 ---
-{self.transcript}
+{transcript}
 ---
 
 Instructions:
@@ -71,64 +173,57 @@ Instructions:
         Returns:
             The assistant's response.
         """
-        # Add user message to history
-        self.history.append(ChatMessage(role="user", content=message))
-        
-        # Build prompt with context
-        context = self._build_context()
-        system_prompt = self._get_system_prompt()
-        
-        # Create user prompt with history context
-        if len(self.history) > 1:
-            user_prompt = f"{context}\n\nUser: {message}\n\nAssistant:"
-        else:
-            user_prompt = f"User question: {message}"
-        
-        # Get response
-        response = self.client.complete(
-            prompt=user_prompt,
-            system=system_prompt,
-        )
-        
-        # Add assistant response to history
-        self.history.append(ChatMessage(role="assistant", content=response))
-        
-        return response
+        return "".join(self.chat_stream(message))
     
-    def chat_stream(self, message: str):
+    def chat_stream(self, message: str) -> Iterator[str]:
         """
         Send a message and stream the response.
         
+        Each chunk is yielded as soon as the provider sends it. The reply is
+        added to the history once the stream ends, including when the
+        consumer stops early or the stream fails partway, so user and
+        assistant turns stay paired. A request that fails before any token
+        leaves the history unchanged.
+        
         Args:
             message: The user's message.
         
         Yields:
             str: Tokens/chunks of the response as they arrive.
         """
+        # Earlier turns go as separate messages after the system prompt, so
+        # each request extends the previous one and the provider can serve
+        # the transcript and old turns from its prompt cache
+        window = self.history[-self.max_history:] if self.max_history else []
+        previous = [{"role": msg.role, "content": msg.content} for msg in window]
+        system_prompt = self._get_system_prompt(message)
+        
         # Add user message to history
         self.history.append(ChatMessage(role="user", content=message))
         
-        # Build prompt with context
-        context = self._build_context()
-        system_prompt = self._get_system_prompt()
-        
-        # Create user prompt with history context
-        if len(self.history) > 1:
-            user_prompt = f"{context}\n\nUser: {message}\n\nAssistant:"
+        parts: List[str] = []
+        try:
+            for token in self.client.complete_stream(
+                prompt=message,
+                system=system_prompt,
+                history=previous,
+            ):
+                parts.append(token)
+                yield token
+        except GeneratorExit:
+            # The consumer stopped early; keep what it already received
+            self.history.append(ChatMessage(role="assistant", content="".join(parts)))
+            raise
+        except Exception:
+            if parts:
+                self.history.append(ChatMessage(role="assistant", content="".join(parts)))
+            else:
+                # Nothing was answered, so drop the question rather than leave
+                # an empty turn that providers reject on the next request
+                self.history.pop()
+            raise
         else:
-            user_prompt = f"User question: {message}"
-        
-        # Stream response
-        full_response = ""
-        for token in self.client.complete_stream(
-            prompt=user_prompt,
-            system=system_prompt,
-        ):
-            full_response += token
-            yield token
-        
-        # Add complete assistant response to history
-        self.history.append(ChatMessage(role="assistant", content=full_response))
+            self.history.append(ChatMessage(role="assistant", content="".join(parts)))
     
     def clear_history(self) -> None:
         """Clear the conversation history."""
@@ -2,8 +2,14 @@
 LLM client factory supporting multiple providers.
 """
 
+import random
+import re
 import time
-from typing import Optional, Protocol
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Union
+
+from pydantic_core import from_json
 
 from video_summarizer.config import LLMConfig, get_config
 
@@ -23,6 +29,172 @@ class LLMClient(Protocol):
     def complete_json(self, prompt: str, system: Optional[str] = None) -> dict:
         """Send a completion request expecting JSON response."""
         ...
+    
+    def complete_stream(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> Iterator[str]:
+        """Stream a completion request, optionally after earlier chat turns."""
+        ...
+
+
+@lru_cache(maxsize=1)
+def get_shared_http_client() -> Any:
+    """
+    Get the process-wide HTTP connection pool for OpenAI-compatible APIs.
+    
+    Every OpenRouterClient shares it, so TLS connections to the API are kept
+    alive and reused across models and requests. HTTP/2 is used when the
+    optional ``h2`` package is installed.
+    
+    Returns:
+        An httpx.Client.
+    """
+    import httpx
+    
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    return httpx.Client(
+        http2=http2,
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_openai_client(api_key: str, base_url: str) -> Any:
+    """
+    Get the process-wide OpenAI client for an API key and endpoint.
+    
+    Clients for different models share it, so building a new
+    OpenRouterClient doesn't rebuild the SDK client or its settings.
+    """
+    from openai import OpenAI
+    
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=get_shared_http_client())
+
+
+# Longest wait between retries, including a server-requested Retry-After
+MAX_RETRY_DELAY = 30.0
+
+
+def _retry_delay(error: Exception, attempt: int, base_delay: float) -> Optional[float]:
+    """
+    Decide whether a failed API call is worth retrying, and after how long.
+    
+    Rate limits (429), timeouts, conflicts and server errors are retried, as
+    are errors with no HTTP status (dropped connections); other 4xx errors
+    such as bad keys or oversized prompts fail on the first attempt. Works
+    on both OpenAI SDK errors (status_code) and Google API errors (code).
+    
+    Args:
+        error: The exception raised by the SDK.
+        attempt: Zero-based number of the attempt that failed.
+        base_delay: Delay before the first retry, in seconds.
+    
+    Returns:
+        Seconds to wait before retrying, or None to give up now.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        code = getattr(error, "code", None)
+        status = code if isinstance(code, int) else None
+    
+    if status is not None and 400 <= status < 500 and status not in (408, 409, 429):
+        return None
+    
+    # Honor the provider's Retry-After when it sent one
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if retry_after is not None:
+        try:
+            return min(MAX_RETRY_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    
+    # Exponential backoff with jitter so concurrent callers don't retry in lockstep
+    return min(MAX_RETRY_DELAY, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+def _open_stream(open_stream, max_retries: int, retry_delay: float) -> Any:
+    """
+    Start a streaming request, retrying failures before any token is sent.
+    
+    Uses the same classification and backoff as complete(); errors raised
+    once the stream is being read are not retried, since tokens may already
+    have reached the caller.
+    """
+    for attempt in range(max_retries):
+        try:
+            return open_stream()
+        except Exception as e:
+            delay = _retry_delay(e, attempt, retry_delay)
+            if delay is None or attempt == max_retries - 1:
+                raise
+            time.sleep(delay)
+
+
+# System prompts at least this long (~1024 tokens, the smallest prefix
+# providers will cache) are marked as a prompt-cache breakpoint
+PROMPT_CACHE_MIN_CHARS = 4096
+
+
+def _build_messages(
+    prompt: str,
+    system: Optional[str] = None,
+    history: Optional[List[Dict[str, str]]] = None,
+) -> list:
+    """
+    Build chat messages, marking a long system prompt as cacheable.
+    
+    OpenAI-family models cache repeated prefixes on their own; Anthropic and
+    Gemini models behind OpenRouter only do so at explicit cache_control
+    breakpoints. Chat sessions resend the whole transcript in the system
+    prompt on every turn, so that prefix is where caching pays off. Earlier
+    turns go in as their own messages, so each follow-up only appends to
+    the previous request instead of changing it.
+    """
+    messages = []
+    if system:
+        if len(system) >= PROMPT_CACHE_MIN_CHARS:
+            messages.append({
+                "role": "system",
+                "content": [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+            })
+        else:
+            messages.append({"role": "system", "content": system})
+    if history:
+        messages.extend({"role": msg["role"], "content": msg["content"]} for msg in history)
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _build_gemini_contents(
+    prompt: str,
+    system: Optional[str] = None,
+    history: Optional[List[Dict[str, str]]] = None,
+) -> list:
+    """
+    Build Gemini contents for a chat turn.
+    
+    Gemini has no system role here, so the system prompt leads the first
+    user turn; together with the earlier turns it forms a prefix that stays
+    identical across a session, which Gemini's implicit caching can reuse.
+    """
+    turns = list(history or []) + [{"role": "user", "content": prompt}]
+    contents = [
+        {"role": "model" if msg["role"] == "assistant" else "user", "parts": [msg["content"]]}
+        for msg in turns
+    ]
+    if system:
+        contents[0]["parts"][0] = f"{system}\n\n{contents[0]['parts'][0]}"
+    return contents
 
 
 class OpenRouterClient:
@@ -37,6 +209,7 @@ class OpenRouterClient:
         base_url: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        http_client: Optional[Any] = None,
     ):
         config = get_config().llm
         
@@ -45,6 +218,7 @@ class OpenRouterClient:
         self.base_url = base_url or config.openrouter_base_url
         self.max_tokens = max_tokens or config.max_tokens
         self.temperature = temperature or config.temperature
+        self.http_client = http_client
         
         self._client = None
     
@@ -64,10 +238,14 @@ class OpenRouterClient:
                 "openai package is not installed. Install it with: pip install openai"
             )
         
-        self._client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-        )
+        if self.http_client is not None:
+            self._client = OpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=self.http_client,
+            )
+        else:
+            self._client = _get_openai_client(self.api_key, self.base_url)
         
         return self._client
     
@@ -82,10 +260,7 @@ class OpenRouterClient:
     ) -> str:
         client = self._get_client()
         
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        messages = _build_messages(prompt, system)
         
         last_error = None
         
@@ -102,8 +277,11 @@ class OpenRouterClient:
                 
             except Exception as e:
                 last_error = e
+                delay = _retry_delay(e, attempt, retry_delay)
+                if delay is None:
+                    raise LLMClientError(f"API call failed: {e}") from e
                 if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
+                    time.sleep(delay)
         
         raise LLMClientError(f"API call failed after {max_retries} retries: {last_error}")
     
@@ -113,27 +291,37 @@ class OpenRouterClient:
         system: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
     ):
         """
         Stream a completion request, yielding tokens as they arrive.
         
+        Args:
+            history: Earlier turns as {"role", "content"} dicts, sent as
+                     messages between the system prompt and this prompt.
+            max_retries: Attempts at opening the stream.
+            retry_delay: Delay before the first retry, in seconds.
+        
         Yields:
             str: Individual tokens/chunks of the response.
         """
         client = self._get_client()
         
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        messages = _build_messages(prompt, system, history)
         
         try:
-            stream = client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=temperature or self.temperature,
-                stream=True,
+            stream = _open_stream(
+                lambda: client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens or self.max_tokens,
+                    temperature=temperature or self.temperature,
+                    stream=True,
+                ),
+                max_retries,
+                retry_delay,
             )
             
             for chunk in stream:
@@ -149,9 +337,6 @@ class OpenRouterClient:
         system: Optional[str] = None,
         max_tokens: Optional[int] = None,
     ) -> dict:
-        import json
-        import re
-        
         response = self.complete(
             prompt=prompt,
             system=system,
@@ -240,8 +425,11 @@ class GoogleAIClient:
                 
             except Exception as e:
                 last_error = e
+                delay = _retry_delay(e, attempt, retry_delay)
+                if delay is None:
+                    raise LLMClientError(f"API call failed: {e}") from e
                 if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
+                    time.sleep(delay)
         
         raise LLMClientError(f"API call failed after {max_retries} retries: {last_error}")
     
@@ -251,10 +439,19 @@ class GoogleAIClient:
         system: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
     ):
         """
         Stream a completion request, yielding tokens as they arrive.
         
+        Args:
+            history: Earlier turns as {"role", "content"} dicts, sent as
+                     user/model contents before this prompt.
+            max_retries: Attempts at opening the stream.
+            retry_delay: Delay before the first retry, in seconds.
+        
         Yields:
             str: Individual tokens/chunks of the response.
         """
@@ -262,10 +459,13 @@ class GoogleAIClient:
         
         client = self._get_client()
         
-        # Combine system prompt with user prompt
-        full_prompt = prompt
-        if system:
-            full_prompt = f"{system}\n\n{prompt}"
+        if history:
+            full_prompt = _build_gemini_contents(prompt, system, history)
+        else:
+            # Combine system prompt with user prompt
+            full_prompt = prompt
+            if system:
+                full_prompt = f"{system}\n\n{prompt}"
         
         generation_config = genai.types.GenerationConfig(
             max_output_tokens=max_tokens or self.max_tokens,
@@ -273,10 +473,14 @@ class GoogleAIClient:
         )
         
         try:
-            response = client.generate_content(
-                full_prompt,
-                generation_config=generation_config,
-                stream=True,
+            response = _open_stream(
+                lambda: client.generate_content(
+                    full_prompt,
+                    generation_config=generation_config,
+                    stream=True,
+                ),
+                max_retries,
+                retry_delay,
             )
             
             for chunk in response:
@@ -302,59 +506,110 @@ class GoogleAIClient:
         return _parse_json_response(response)
 
 
+# Markdown code blocks that may hold the JSON, tried in order; the last two
+# also match a block whose closing fence was cut off
+_JSON_BLOCK_PATTERNS = [
+    re.compile(r'```json\s*\n([\s\S]*?)\n```'),  # Complete code block with json
+    re.compile(r'```\s*\n([\s\S]*?)\n```'),       # Complete code block without json
+    re.compile(r'```json\s*\n([\s\S]*)'),         # Code block that might be cut off
+    re.compile(r'```\s*\n([\s\S]*)'),             # Code block without json that might be cut off
+]
+_TRAILING_FENCE = re.compile(r'```\s*$')
+_JSON_OBJECT = re.compile(r'\{[\s\S]*\}')
+
+
+def _first_json_object(text: str, start: int) -> Optional[str]:
+    """
+    Return the balanced {...} span opening at text[start], or None if it never closes.
+    
+    Braces inside JSON strings (and escaped quotes within them) are skipped,
+    so the span ends where the object does rather than at the last brace.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return None
+
+
 def _parse_json_response(response: str) -> dict:
-    """Parse JSON from LLM response, handling various formats."""
-    import json
-    import re
+    """
+    Parse JSON from LLM response, handling various formats.
     
+    Candidates are decoded with pydantic-core's Rust parser, which is several
+    times faster than the stdlib on large clip lists and raises ValueError on
+    invalid input, so each repair attempt stays cheap.
+    """
     # Clean response - remove any leading/trailing whitespace
     response = response.strip()
     
     # Try direct parsing first
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
+        return from_json(response)
+    except ValueError:
         pass
     
     # Try to find JSON in markdown code blocks (with or without closing ```)
     # Handle case where response might be cut off
-    json_patterns = [
-        r'```json\s*\n([\s\S]*?)\n```',  # Complete code block with json
-        r'```\s*\n([\s\S]*?)\n```',       # Complete code block without json
-        r'```json\s*\n([\s\S]*)',         # Code block that might be cut off
-        r'```\s*\n([\s\S]*)',             # Code block without json that might be cut off
-    ]
-    
-    for pattern in json_patterns:
-        json_match = re.search(pattern, response)
+    for pattern in _JSON_BLOCK_PATTERNS:
+        json_match = pattern.search(response)
         if json_match:
             json_str = json_match.group(1).strip()
             # Remove trailing ``` if present
-            json_str = re.sub(r'```\s*$', '', json_str).strip()
+            json_str = _TRAILING_FENCE.sub('', json_str).strip()
             
             try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
+                return from_json(json_str)
+            except ValueError:
                 # Try to fix incomplete JSON by closing brackets
                 fixed = _try_fix_incomplete_json(json_str)
                 if fixed:
                     try:
-                        return json.loads(fixed)
-                    except json.JSONDecodeError:
+                        return from_json(fixed)
+                    except ValueError:
                         pass
     
+    # Decode the first complete object; unlike the greedy regex below this
+    # isn't thrown off by braces in prose after the object
+    start = response.find('{')
+    if start != -1:
+        first_object = _first_json_object(response, start)
+        if first_object:
+            try:
+                return from_json(first_object)
+            except ValueError:
+                pass
+    
     # Try to find JSON object in the response
-    obj_match = re.search(r'\{[\s\S]*\}', response)
+    obj_match = _JSON_OBJECT.search(response)
     if obj_match:
         try:
-            return json.loads(obj_match.group(0))
-        except json.JSONDecodeError:
+            return from_json(obj_match.group(0))
+        except ValueError:
             # Try to fix incomplete JSON
             fixed = _try_fix_incomplete_json(obj_match.group(0))
             if fixed:
                 try:
-                    return json.loads(fixed)
-                except json.JSONDecodeError:
+                    return from_json(fixed)
+                except ValueError:
                     pass
     
     raise LLMClientError(f"Failed to parse JSON from response: {response[:500]}")
@@ -397,6 +652,42 @@ def _try_fix_incomplete_json(json_str: str) -> str:
     return fixed
 
 
+def complete_many(
+    client: LLMClient,
+    prompts: List[str],
+    system: Optional[str] = None,
+    concurrency: int = 8,
+) -> List[Union[str, Exception]]:
+    """
+    Send several independent completion requests concurrently.
+    
+    At most `concurrency` requests are in flight at once; each one keeps the
+    client's own retry handling. The calls mostly wait on the network and
+    share the pooled HTTP connections, so threads are enough to overlap them.
+    
+    Args:
+        client: LLM client to send the requests with.
+        prompts: User prompts, one request each.
+        system: System prompt shared by every request.
+        concurrency: Maximum number of requests in flight.
+    
+    Returns:
+        One entry per prompt, in order: the response text, or the exception
+        that request failed with.
+    """
+    if not prompts:
+        return []
+    
+    def _one(prompt: str) -> Union[str, Exception]:
+        try:
+            return client.complete(prompt=prompt, system=system)
+        except Exception as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts))) as executor:
+        return list(executor.map(_one, prompts))
+
+
 def get_llm_client(
     provider: Optional[str] = None,
     api_key: Optional[str] = None,
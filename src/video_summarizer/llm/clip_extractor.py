@@ -5,10 +5,15 @@ Video clip extraction using FFmpeg.
 import json
 import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Union
 
+from pydantic_core import to_json
+
 from video_summarizer.llm.models import Clip
+from video_summarizer.utils import atomic_write
 
 
 class ClipExtractionError(Exception):
@@ -16,6 +21,11 @@ class ClipExtractionError(Exception):
     pass
 
 
+# Caps FFmpeg cuts across every caller in the process, so concurrent
+# extract_clips requests share the CPUs instead of each taking all of them
+_ffmpeg_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+
 def extract_clip(
     video_path: str,
     output_path: str,
@@ -53,6 +63,8 @@ def extract_clip(
         # Re-encode for accurate cuts
         cmd = [
             "ffmpeg",
+            "-nostdin",
+            "-loglevel", "error",
             "-ss", str(start),
             "-i", str(video_path),
             "-t", str(duration),
@@ -65,21 +77,25 @@ def extract_clip(
         # Fast copy mode (may have slight timing inaccuracies at keyframes)
         cmd = [
             "ffmpeg",
+            "-nostdin",
+            "-loglevel", "error",
             "-ss", str(start),
             "-i", str(video_path),
             "-t", str(duration),
             "-c", "copy",
+            "-avoid_negative_ts", "make_zero",
             "-y",
             str(output_path),
         ]
     
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        with _ffmpeg_slots:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
     except subprocess.CalledProcessError as e:
         raise ClipExtractionError(f"FFmpeg failed: {e.stderr}") from e
     except FileNotFoundError:
@@ -96,16 +112,23 @@ def extract_clips(
     output_dir: str,
     reencode: bool = False,
     filename_template: str = "clip_{index:02d}_{title}",
+    max_workers: Optional[int] = None,
 ) -> List[str]:
     """
     Extract multiple clips from a video.
     
+    Clips are cut by concurrent FFmpeg processes; the returned paths keep
+    the order of the input clips. When stream copy fails for a clip, that
+    clip alone is retried with re-encoding.
+    
     Args:
         video_path: Path to the source video.
         clips: List of Clip objects with timing information.
         output_dir: Directory to save extracted clips.
         reencode: If True, re-encode clips (slower but more accurate).
         filename_template: Template for clip filenames.
+        max_workers: Maximum number of concurrent FFmpeg processes.
+                     Defaults to the number of CPUs.
     
     Returns:
         List of paths to extracted clips.
@@ -113,9 +136,10 @@ def extract_clips(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    extracted_paths = []
+    # Get source extension
+    source_ext = Path(video_path).suffix
     
-    for i, clip in enumerate(clips):
+    def _extract(i: int, clip: Clip) -> Optional[str]:
         # Sanitize title for filename
         safe_title = "".join(
             c if c.isalnum() or c in "._- " else "_"
@@ -127,24 +151,44 @@ def extract_clips(
             title=safe_title,
         )
         
-        # Get source extension
-        source_ext = Path(video_path).suffix
         output_path = output_dir / f"{filename}{source_ext}"
         
         try:
-            extracted_path = extract_clip(
+            return extract_clip(
                 video_path=video_path,
                 output_path=str(output_path),
                 start=clip.start,
                 end=clip.end,
                 reencode=reencode,
             )
-            extracted_paths.append(extracted_path)
         except ClipExtractionError as e:
+            if not reencode:
+                # Stream copy can fail on some containers/cut points; re-encode
+                # just this clip rather than the whole batch
+                try:
+                    return extract_clip(
+                        video_path=video_path,
+                        output_path=str(output_path),
+                        start=clip.start,
+                        end=clip.end,
+                        reencode=True,
+                    )
+                except ClipExtractionError as retry_error:
+                    e = retry_error
             # Continue with other clips if one fails
             print(f"Warning: Failed to extract clip {i + 1}: {e}")
+            return None
+    
+    if not clips:
+        return []
     
-    return extracted_paths
+    # FFmpeg does the work in child processes, so threads are enough to run them in parallel
+    workers = min(len(clips), max_workers or os.cpu_count() or 1)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_extract, range(len(clips)), clips))
+    
+    return [path for path in results if path is not None]
 
 
 def save_clips_metadata(
@@ -166,8 +210,8 @@ def save_clips_metadata(
         "total_clips": len(clips),
     }
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # pydantic-core's Rust encoder; same output as json.dumps(ensure_ascii=False, indent=2)
+    atomic_write(output_path, to_json(data, indent=2))
 
 
 def load_clips_metadata(path: Union[str, Path]) -> List[Clip]:
@@ -188,18 +232,58 @@ def load_clips_metadata(path: Union[str, Path]) -> List[Clip]:
     return [Clip.from_dict(clip_data) for clip_data in data.get("clips", [])]
 
 
+def _probe_stream_params(path: str) -> Optional[tuple]:
+    """
+    Get the stream parameters that must match for a stream-copy concat.
+    
+    Args:
+        path: Path to a video file.
+    
+    Returns:
+        Tuple describing each stream, or None if FFprobe fails.
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,profile,width,height,pix_fmt,sample_rate,channels,time_base",
+        "-of", "json",
+        str(path),
+    ]
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        streams = json.loads(result.stdout).get("streams", [])
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        return None
+    
+    return tuple(tuple(sorted(stream.items())) for stream in streams)
+
+
+def _can_stream_copy(clip_paths: List[str]) -> bool:
+    """Check whether all clips share codec parameters so they can be concatenated without re-encoding."""
+    first = _probe_stream_params(clip_paths[0])
+    if not first:
+        return False
+    return all(_probe_stream_params(clip) == first for clip in clip_paths[1:])
+
+
 def merge_clips(
     clip_paths: List[str],
     output_path: str,
-    reencode: bool = True,
+    reencode: bool = False,
 ) -> str:
     """
     Merge multiple video clips into a single video file.
     
+    By default the clips are joined with the concat demuxer and stream copy,
+    which avoids decoding and re-encoding. If the clips do not share codec
+    parameters (or the copy fails), they are re-encoded instead.
+    
     Args:
         clip_paths: List of paths to video clips (in order).
         output_path: Path for the merged output video.
-        reencode: If True, re-encode for consistent output. If False, use concat demuxer.
+        reencode: If True, always re-encode for consistent output.
     
     Returns:
         Path to the merged video.
@@ -207,66 +291,81 @@ def merge_clips(
     Raises:
         ClipExtractionError: If FFmpeg fails.
     """
-    import tempfile
-    
     if not clip_paths:
         raise ClipExtractionError("No clips provided for merging")
     
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    if reencode:
-        # Use filter_complex for re-encoding (more compatible)
-        # Build input arguments
-        input_args = []
-        filter_parts = []
-        
-        for i, clip in enumerate(clip_paths):
-            input_args.extend(["-i", str(clip)])
-            filter_parts.append(f"[{i}:v][{i}:a]")
-        
-        filter_str = "".join(filter_parts) + f"concat=n={len(clip_paths)}:v=1:a=1[outv][outa]"
+    if not reencode and _can_stream_copy(clip_paths):
+        try:
+            return _merge_stream_copy(clip_paths, output_path)
+        except ClipExtractionError as e:
+            print(f"Warning: Stream-copy merge failed, re-encoding instead: {e}")
+    
+    return _merge_reencode(clip_paths, output_path)
+
+
+def _merge_stream_copy(clip_paths: List[str], output_path: Path) -> str:
+    """Merge clips with the concat demuxer without re-encoding (requires same codecs)."""
+    import tempfile
+    
+    # Create a temporary concat file
+    fd, concat_file = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for clip in clip_paths:
+                # Escape single quotes in path
+                escaped_path = str(Path(clip).absolute()).replace("'", "'\\''")
+                f.write(f"file '{escaped_path}'\n")
         
         cmd = [
             "ffmpeg",
-            *input_args,
-            "-filter_complex", filter_str,
-            "-map", "[outv]",
-            "-map", "[outa]",
-            "-c:v", "libx264",
-            "-c:a", "aac",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", concat_file,
+            "-c", "copy",
             "-y",
             str(output_path),
         ]
-    else:
-        # Use concat demuxer (faster, but requires same codec)
-        # Create a temporary concat file
-        fd, concat_file = tempfile.mkstemp(suffix=".txt")
+        
         try:
-            with os.fdopen(fd, "w") as f:
-                for clip in clip_paths:
-                    # Escape single quotes in path
-                    escaped_path = str(Path(clip).absolute()).replace("'", "'\\''")
-                    f.write(f"file '{escaped_path}'\n")
-            
-            cmd = [
-                "ffmpeg",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", concat_file,
-                "-c", "copy",
-                "-y",
-                str(output_path),
-            ]
-            
-            try:
-                subprocess.run(cmd, capture_output=True, text=True, check=True)
-            except subprocess.CalledProcessError as e:
-                raise ClipExtractionError(f"FFmpeg merge failed: {e.stderr}") from e
-            
-            return str(output_path)
-        finally:
-            os.unlink(concat_file)
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise ClipExtractionError(f"FFmpeg merge failed: {e.stderr}") from e
+        except FileNotFoundError:
+            raise ClipExtractionError(
+                "FFmpeg not found. Please install FFmpeg and ensure it's in your PATH."
+            )
+        
+        return str(output_path)
+    finally:
+        os.unlink(concat_file)
+
+
+def _merge_reencode(clip_paths: List[str], output_path: Path) -> str:
+    """Merge clips with filter_complex, re-encoding to H.264/AAC (works across codecs)."""
+    # Build input arguments
+    input_args = []
+    filter_parts = []
+    
+    for i, clip in enumerate(clip_paths):
+        input_args.extend(["-i", str(clip)])
+        filter_parts.append(f"[{i}:v][{i}:a]")
+    
+    filter_str = "".join(filter_parts) + f"concat=n={len(clip_paths)}:v=1:a=1[outv][outa]"
+    
+    cmd = [
+        "ffmpeg",
+        *input_args,
+        "-filter_complex", filter_str,
+        "-map", "[outv]",
+        "-map", "[outa]",
+        "-c:v", "libx264",
+        "-c:a", "aac",
+        "-y",
+        str(output_path),
+    ]
     
     try:
         subprocess.run(cmd, capture_output=True, text=True, check=True)
@@ -278,4 +377,3 @@ def merge_clips(
         )
     
     return str(output_path)
-
@@ -2,8 +2,10 @@
 Video summarization and clip extraction using LLM.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Union
 
+from video_summarizer.llm.cache import ResponseCache
 from video_summarizer.llm.client import get_llm_client, LLMClient, GoogleAIClient, OpenRouterClient
 from video_summarizer.llm.models import Clip, Summary
 from video_summarizer.llm.prompts import get_summarize_prompt, get_extract_clips_prompt
@@ -23,6 +25,7 @@ class VideoSummarizer:
         provider: Optional[str] = None,
         model: Optional[str] = None,
         api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
     ):
         """
         Initialize the video summarizer.
@@ -32,11 +35,27 @@ class VideoSummarizer:
             provider: LLM provider ("google" or "openrouter"). Defaults to config.
             model: Optional model override.
             api_key: Optional API key override.
+            cache: Optional response cache; identical requests are then
+                   answered from disk instead of the LLM.
         """
         if client:
             self.client = client
         else:
             self.client = get_llm_client(provider=provider, model=model, api_key=api_key)
+        self.cache = cache
+    
+    def _complete_json(self, prompt: str, system: str, **kwargs) -> dict:
+        """Request a JSON completion, answering from the response cache when possible."""
+        if self.cache is None:
+            return self.client.complete_json(prompt=prompt, system=system, **kwargs)
+        
+        model = f"{type(self.client).__name__}:{getattr(self.client, 'model', '')}"
+        key = self.cache.key(model, system, prompt, **kwargs)
+        response = self.cache.get(key)
+        if response is None:
+            response = self.client.complete_json(prompt=prompt, system=system, **kwargs)
+            self.cache.set(key, response)
+        return response
     
     def summarize(self, transcript: str, output_language: str = "original") -> Summary:
         """
@@ -51,7 +70,7 @@ class VideoSummarizer:
         """
         system_prompt, user_prompt = get_summarize_prompt(transcript, output_language)
         
-        response = self.client.complete_json(
+        response = self._complete_json(
             prompt=user_prompt,
             system=system_prompt,
         )
@@ -82,7 +101,7 @@ class VideoSummarizer:
         """
         system_prompt, user_prompt = get_extract_clips_prompt(transcript, num_clips)
         
-        response = self.client.complete_json(
+        response = self._complete_json(
             prompt=user_prompt,
             system=system_prompt,
             max_tokens=4000,  # Clips need more tokens for multiple descriptions
@@ -125,6 +144,8 @@ class VideoSummarizer:
         """
         Process a transcript to generate both summary and clips.
         
+        The summary and clip requests are sent concurrently.
+        
         Args:
             transcript: The video transcript in SRT format.
             num_clips: Number of clips to extract.
@@ -133,7 +154,11 @@ class VideoSummarizer:
         Returns:
             Tuple of (Summary, List[Clip]).
         """
-        summary = self.summarize(transcript, output_language=output_language)
-        clips = self.extract_clips(transcript, num_clips=num_clips)
+        # The two requests are independent and mostly wait on the network,
+        # so clip selection runs on a second thread alongside the summary
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            clips_future = executor.submit(self.extract_clips, transcript, num_clips=num_clips)
+            summary = self.summarize(transcript, output_language=output_language)
+            clips = clips_future.result()
         
         return summary, clips
@@ -8,22 +8,36 @@ Provides functionality for:
 - Formatting transcriptions as SRT
 """
 
-from video_summarizer.transcription.audio_extractor import extract_audio
+from video_summarizer.transcription.audio_extractor import (
+    extract_audio,
+    extract_audio_array,
+)
 from video_summarizer.transcription.youtube_downloader import (
     download_video,
     is_youtube_url,
 )
-from video_summarizer.transcription.transcriber import WhisperTranscriber
+from video_summarizer.transcription.transcriber import (
+    WhisperTranscriber,
+    get_transcriber,
+    pin_transcriber_gpu,
+)
 from video_summarizer.transcription.srt_formatter import (
     format_as_srt,
     save_srt,
+    load_srt,
+    srt_to_text,
 )
 
 __all__ = [
     "extract_audio",
+    "extract_audio_array",
     "download_video",
     "is_youtube_url",
     "WhisperTranscriber",
+    "get_transcriber",
+    "pin_transcriber_gpu",
     "format_as_srt",
     "save_srt",
+    "load_srt",
+    "srt_to_text",
 ]
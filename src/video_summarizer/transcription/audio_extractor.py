@@ -83,6 +83,65 @@ def extract_audio(
     return str(output_path)
 
 
+def extract_audio_array(
+    video_path: str,
+    sample_rate: int = 16000,
+):
+    """
+    Decode the audio track of a video straight into memory using FFmpeg.
+    
+    FFmpeg writes mono 32-bit float PCM to a pipe, which is wrapped as a
+    NumPy array without an intermediate WAV file. The result can be passed
+    directly to WhisperTranscriber.transcribe.
+    
+    Args:
+        video_path: Path to the input video file.
+        sample_rate: Audio sample rate in Hz (default: 16000 for Whisper).
+    
+    Returns:
+        1-D float32 NumPy array of audio samples in [-1, 1].
+    
+    Raises:
+        AudioExtractionError: If FFmpeg fails.
+        FileNotFoundError: If the input video file doesn't exist.
+    """
+    import numpy as np
+    
+    video_path = Path(video_path)
+    
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+    
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-i", str(video_path),
+        "-vn",  # No video
+        "-f", "f32le",  # Raw 32-bit float PCM
+        "-acodec", "pcm_f32le",
+        "-ar", str(sample_rate),  # Sample rate
+        "-ac", "1",  # Mono audio
+        "-",  # Write to stdout
+    ]
+    
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise AudioExtractionError(
+            f"FFmpeg failed to extract audio: {e.stderr.decode(errors='replace')}"
+        ) from e
+    except FileNotFoundError:
+        raise AudioExtractionError(
+            "FFmpeg not found. Please install FFmpeg and ensure it's in your PATH."
+        )
+    
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
 def get_video_duration(video_path: str) -> float:
     """
     Get the duration of a video in seconds using FFprobe.
@@ -2,10 +2,17 @@
 SRT subtitle format utilities.
 """
 
+import io
+import re
 from pathlib import Path
 from typing import List, Union
 
 from video_summarizer.transcription.transcriber import TranscriptionSegment
+from video_summarizer.utils import atomic_write
+
+_TIMESTAMP_LINE = re.compile(
+    r'(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}),(\d{3})'
+)
 
 
 def format_timestamp(seconds: float) -> str:
@@ -65,13 +72,10 @@ def format_as_srt(segments: List[TranscriptionSegment]) -> str:
     Returns:
         Complete SRT file content as a string.
     """
-    srt_entries = []
-    
-    for i, segment in enumerate(segments, start=1):
-        entry = format_segment_as_srt(i, segment)
-        srt_entries.append(entry)
-    
-    return "\n".join(srt_entries)
+    return "\n".join(
+        format_segment_as_srt(i, segment)
+        for i, segment in enumerate(segments, start=1)
+    )
 
 
 def save_srt(
@@ -92,8 +96,7 @@ def save_srt(
     
     srt_content = format_as_srt(segments)
     
-    with open(output_path, "w", encoding=encoding) as f:
-        f.write(srt_content)
+    atomic_write(output_path, srt_content, encoding=encoding)
 
 
 def parse_srt(content: str) -> List[TranscriptionSegment]:
@@ -106,8 +109,6 @@ def parse_srt(content: str) -> List[TranscriptionSegment]:
     Returns:
         List of TranscriptionSegment objects.
     """
-    import re
-    
     segments = []
     
     # Split by double newlines (entries are separated by blank lines)
@@ -121,10 +122,7 @@ def parse_srt(content: str) -> List[TranscriptionSegment]:
         
         # Parse timestamp line
         timestamp_line = lines[1]
-        match = re.match(
-            r'(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}),(\d{3})',
-            timestamp_line
-        )
+        match = _TIMESTAMP_LINE.match(timestamp_line)
         
         if not match:
             continue
@@ -174,3 +172,52 @@ def load_srt(path: Union[str, Path], encoding: str = "utf-8") -> List[Transcript
         content = f.read()
     
     return parse_srt(content)
+
+
+def srt_to_text(path: Union[str, Path], encoding: str = "utf-8") -> str:
+    """
+    Extract the plain text of an SRT file without building segment objects.
+    
+    Streams the file line by line, skipping entry indices and timestamp
+    lines. Entries whose timestamp line is malformed are dropped, as
+    parse_srt does, so the text matches joining the segments from
+    load_srt with newlines.
+    
+    Args:
+        path: Path to the SRT file.
+        encoding: File encoding (default: UTF-8).
+    
+    Returns:
+        Transcript text with one line per subtitle line.
+    """
+    buf = io.StringIO()
+    state = "index"
+    first = True
+    
+    with open(path, "r", encoding=encoding) as f:
+        for raw_line in f:
+            line = raw_line.strip()
+            
+            if not line:
+                # Blank line ends the current entry
+                state = "index"
+                continue
+            
+            if state == "index":
+                state = "timing"
+                continue
+            
+            if state == "timing":
+                # parse_srt drops the whole entry when its timing doesn't parse
+                state = "text" if _TIMESTAMP_LINE.match(line) else "skip"
+                continue
+            
+            if state == "skip":
+                continue
+            
+            if not first:
+                buf.write("\n")
+            buf.write(line)
+            first = False
+    
+    return buf.getvalue()
@@ -2,8 +2,12 @@
 Whisper transcription using faster-whisper.
 """
 
+import threading
+from collections import Counter
 from dataclasses import dataclass
-from typing import Iterator, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Union
 
 from video_summarizer.config import WhisperConfig, get_config
 
@@ -27,6 +31,65 @@ class TranscriptionError(Exception):
     pass
 
 
+# A segment repeating any 4-word phrase this often is a decoder loop
+LOOP_NGRAM_SIZE = 4
+LOOP_MAX_REPEATS = 4
+
+
+def is_repetition_loop(
+    text: str,
+    ngram_size: int = LOOP_NGRAM_SIZE,
+    max_repeats: int = LOOP_MAX_REPEATS,
+) -> bool:
+    """
+    Check whether a segment is a Whisper hallucination loop.
+    
+    Args:
+        text: Segment text.
+        ngram_size: Number of words per n-gram.
+        max_repeats: Occurrences of one n-gram that mark a loop.
+    
+    Returns:
+        True if any n-gram occurs at least max_repeats times.
+    """
+    words = text.split()
+    if len(words) < ngram_size * max_repeats:
+        return False
+    ngrams = Counter(zip(*(words[i:] for i in range(ngram_size))))
+    return max(ngrams.values()) >= max_repeats
+
+
+def resolve_compute_type(device: str, compute_type: Optional[str]) -> str:
+    """
+    Pick the CTranslate2 compute type for a device.
+    
+    CPUs run int8 (quantized weights, VNNI/AVX-512 dot products) since they
+    have no fast float16 kernels; GPUs default to float16.
+    
+    Args:
+        device: Resolved device ("cpu" or "cuda").
+        compute_type: Configured compute type, or "auto"/None.
+    
+    Returns:
+        Compute type to pass to faster-whisper.
+    """
+    if device == "cpu" and compute_type in (None, "auto", "float16", "int8_float16"):
+        return "int8"
+    if compute_type in (None, "auto"):
+        return "float16"
+    return compute_type
+
+
+def _cuda_device_count() -> int:
+    """Count visible CUDA devices, or 0 if CUDA is unavailable."""
+    try:
+        # ctranslate2 ships with faster-whisper, unlike torch
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count()
+    except (ImportError, RuntimeError):
+        return 0
+
+
 class WhisperTranscriber:
     """
     Transcriber using faster-whisper for Whisper model inference.
@@ -42,6 +105,8 @@ class WhisperTranscriber:
         language: Optional[str] = None,
         device: Optional[str] = None,
         compute_type: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        device_index: Optional[int] = None,
     ):
         """
         Initialize the transcriber.
@@ -53,8 +118,16 @@ class WhisperTranscriber:
                       Defaults to config value.
             device: Device to use ("auto", "cuda", "cpu").
                     Defaults to config value.
-            compute_type: Precision type ("float16", "int8", "float32").
-                          Defaults to config value.
+            compute_type: Precision type ("auto", "float16", "int8_float16",
+                          "int8", "float32"). Defaults to config value; "auto"
+                          uses int8 on CPU and float16 on GPU.
+            batch_size: Number of VAD chunks decoded per forward pass. Values
+                        above 1 use faster-whisper's batched pipeline.
+                        Defaults to config value.
+            device_index: GPU to load the model onto, wrapped around the
+                          number of visible GPUs. None puts a replica on
+                          every GPU, which only helps a single process
+                          that transcribes from several threads at once.
         """
         config = get_config().whisper
         
@@ -62,8 +135,33 @@ class WhisperTranscriber:
         self.language = language or config.language
         self.device = device or config.device
         self.compute_type = compute_type or config.compute_type
+        self.batch_size = batch_size if batch_size is not None else config.batch_size
+        self.device_index = device_index
         
         self._model = None
+        self._batched = None
+    
+    @staticmethod
+    def _resolve_audio(audio: Union[str, Path, Any]) -> Any:
+        """Validate a path input, or pass an in-memory audio array through unchanged."""
+        if isinstance(audio, (str, Path)):
+            audio_path = Path(audio)
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+            return str(audio_path)
+        return audio
+    
+    def load_model(self) -> None:
+        """
+        Load the Whisper model now instead of on the first transcription.
+        
+        Safe to call from a background thread to overlap the weight load with
+        other work, such as audio extraction.
+        
+        Raises:
+            TranscriptionError: If the model can't be loaded.
+        """
+        self._load_model()
     
     def _load_model(self):
         """Lazy load the Whisper model."""
@@ -80,19 +178,22 @@ class WhisperTranscriber:
         try:
             # Determine device
             device = self.device
-            compute_type = self.compute_type
+            
+            gpu_count = _cuda_device_count() if device in ("auto", "cuda") else 0
             
             if device == "auto":
-                try:
-                    import torch
-                    if torch.cuda.is_available():
-                        device = "cuda"
-                    else:
-                        device = "cpu"
-                        compute_type = "int8"  # Use int8 for CPU
-                except ImportError:
-                    device = "cpu"
-                    compute_type = "int8"
+                device = "cuda" if gpu_count > 0 else "cpu"
+            
+            compute_type = resolve_compute_type(device, self.compute_type)
+            
+            gpu_kwargs = {}
+            if device == "cuda" and gpu_count > 1:
+                if self.device_index is not None:
+                    gpu_kwargs = {"device_index": self.device_index % gpu_count}
+                else:
+                    # CTranslate2 keeps a replica on each GPU and dispatches
+                    # concurrent transcribe calls across them
+                    gpu_kwargs = {"device_index": list(range(gpu_count)), "num_workers": gpu_count}
             
             # Try to load with selected device
             try:
@@ -100,6 +201,7 @@ class WhisperTranscriber:
                     self.model_name,
                     device=device,
                     compute_type=compute_type,
+                    **gpu_kwargs,
                 )
             except Exception as cuda_error:
                 # If CUDA fails, fall back to CPU
@@ -118,23 +220,33 @@ class WhisperTranscriber:
         except Exception as e:
             raise TranscriptionError(f"Failed to load Whisper model: {e}") from e
     
+    def _get_batched_pipeline(self):
+        """Lazy wrap the loaded model in faster-whisper's batched pipeline."""
+        if self._batched is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched = BatchedInferencePipeline(model=self._model)
+        return self._batched
+    
     def transcribe(
         self,
-        audio_path: str,
+        audio_path: Union[str, Path, Any],
         language: Optional[str] = None,
         task: str = "transcribe",
         beam_size: int = 5,
         vad_filter: bool = True,
+        batch_size: Optional[int] = None,
     ) -> List[TranscriptionSegment]:
         """
         Transcribe an audio file.
         
         Args:
-            audio_path: Path to the audio file.
+            audio_path: Path to the audio file, or a 16 kHz mono float32 NumPy
+                        array (see extract_audio_array).
             language: Override the default language for this transcription.
             task: "transcribe" or "translate" (translate to English).
             beam_size: Beam size for decoding.
             vad_filter: Whether to use VAD to filter out silence.
+            batch_size: Override the default batch size for this transcription.
         
         Returns:
             List of TranscriptionSegment objects with timing and text.
@@ -143,43 +255,23 @@ class WhisperTranscriber:
             TranscriptionError: If transcription fails.
             FileNotFoundError: If the audio file doesn't exist.
         """
-        from pathlib import Path
-        
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
-        self._load_model()
-        
-        language = language or self.language
-        
-        try:
-            segments_iter, info = self._model.transcribe(
-                str(audio_path),
-                language=language,
-                task=task,
-                beam_size=beam_size,
-                vad_filter=vad_filter,
-            )
-            
-            # Convert to our segment format
-            segments = []
-            for segment in segments_iter:
-                segments.append(TranscriptionSegment(
-                    start=segment.start,
-                    end=segment.end,
-                    text=segment.text.strip(),
-                ))
-            
-            return segments
-            
-        except Exception as e:
-            raise TranscriptionError(f"Transcription failed: {e}") from e
+        return list(self.transcribe_streaming(
+            audio_path,
+            language=language,
+            task=task,
+            beam_size=beam_size,
+            vad_filter=vad_filter,
+            batch_size=batch_size,
+        ))
     
     def transcribe_streaming(
         self,
-        audio_path: str,
+        audio_path: Union[str, Path, Any],
         language: Optional[str] = None,
+        task: str = "transcribe",
+        beam_size: int = 5,
+        vad_filter: bool = True,
+        batch_size: Optional[int] = None,
     ) -> Iterator[TranscriptionSegment]:
         """
         Transcribe an audio file with streaming output.
@@ -187,31 +279,118 @@ class WhisperTranscriber:
         Yields segments as they are transcribed, useful for progress reporting.
         
         Args:
-            audio_path: Path to the audio file.
+            audio_path: Path to the audio file, or a 16 kHz mono float32 NumPy array.
             language: Override the default language.
+            task: "transcribe" or "translate" (translate to English).
+            beam_size: Beam size for decoding.
+            vad_filter: Whether to use VAD to filter out silence.
+            batch_size: Override the default batch size.
         
         Yields:
             TranscriptionSegment objects as they are generated.
-        """
-        from pathlib import Path
         
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        Raises:
+            TranscriptionError: If transcription fails.
+            FileNotFoundError: If the audio file doesn't exist.
+        """
+        audio = self._resolve_audio(audio_path)
         
         self._load_model()
         
         language = language or self.language
+        batch_size = batch_size if batch_size is not None else self.batch_size
         
-        segments_iter, info = self._model.transcribe(
-            str(audio_path),
-            language=language,
-            vad_filter=True,
-        )
-        
-        for segment in segments_iter:
-            yield TranscriptionSegment(
-                start=segment.start,
-                end=segment.end,
-                text=segment.text.strip(),
-            )
+        try:
+            if batch_size > 1:
+                # VAD splits the audio into chunks that share one encoder/decoder pass
+                segments_iter, info = self._get_batched_pipeline().transcribe(
+                    audio,
+                    language=language,
+                    task=task,
+                    beam_size=beam_size,
+                    batch_size=batch_size,
+                )
+            else:
+                segments_iter, info = self._model.transcribe(
+                    audio,
+                    language=language,
+                    task=task,
+                    beam_size=beam_size,
+                    vad_filter=vad_filter,
+                    # Decode each window on its own so a hallucination can't
+                    # carry over into the rest of the file
+                    condition_on_previous_text=False,
+                )
+            
+            # Segments are decoded lazily as the iterator advances
+            for segment in segments_iter:
+                if is_repetition_loop(segment.text):
+                    continue
+                yield TranscriptionSegment(
+                    start=segment.start,
+                    end=segment.end,
+                    text=segment.text.strip(),
+                )
+            
+        except Exception as e:
+            raise TranscriptionError(f"Transcription failed: {e}") from e
+
+
+# GPU for transcribers built by get_transcriber in this process; set once
+# per pool worker so each loads a single replica (see pin_transcriber_gpu)
+_default_device_index: Optional[int] = None
+
+
+def pin_transcriber_gpu(slot: int) -> None:
+    """
+    Make transcribers from get_transcriber load onto a single GPU.
+    
+    A pool worker transcribes one job at a time, so a replica on every GPU
+    only multiplies VRAM use. Giving each worker its own slot spreads the
+    workers over the GPUs round-robin instead. Call before the first
+    get_transcriber in the process.
+    
+    Args:
+        slot: Worker number; wrapped around the number of visible GPUs.
+    """
+    global _default_device_index
+    _default_device_index = slot
+
+
+# lru_cache doesn't serialize misses, so two threads asking for the same
+# key at once would both load the model; the lock makes the first the only one
+_transcriber_lock = threading.Lock()
+
+
+@lru_cache(maxsize=2)
+def _build_transcriber(
+    model: Optional[str],
+    device: Optional[str],
+    compute_type: Optional[str],
+) -> WhisperTranscriber:
+    return WhisperTranscriber(
+        model=model, device=device, compute_type=compute_type, device_index=_default_device_index
+    )
+
+
+def get_transcriber(
+    model: Optional[str] = None,
+    device: Optional[str] = None,
+    compute_type: Optional[str] = None,
+) -> WhisperTranscriber:
+    """
+    Get a shared transcriber so the Whisper weights load once per process.
+    
+    Instances are cached per (model, device, compute_type); the language is
+    not part of the key since it is passed to each transcribe() call.
+    
+    Args:
+        model: Whisper model to use. Defaults to config value.
+        device: Device to use ("auto", "cuda", "cpu"). Defaults to config value.
+        compute_type: Precision type. Defaults to config value.
+    
+    Returns:
+        The cached WhisperTranscriber for these settings.
+    """
+    with _transcriber_lock:
+        return _build_transcriber(model, device, compute_type)
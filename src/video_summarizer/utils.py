@@ -0,0 +1,183 @@
+"""
+Shared file and caching utilities.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from secrets import token_hex
+from typing import Any, Hashable, Optional, Union
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _open_unnamed(directory: Path) -> Optional[int]:
+    """Open an unnamed file in directory (Linux O_TMPFILE), or None if unsupported."""
+    flag = getattr(os, "O_TMPFILE", None)
+    if flag is None:
+        return None
+    try:
+        return os.open(directory, flag | os.O_WRONLY, 0o644)
+    except OSError:
+        # Filesystem or kernel without O_TMPFILE support
+        return None
+
+
+def _link_unnamed(fd: int, path: Path) -> bool:
+    """Give the unnamed file behind fd the name path, or return False if the link is refused."""
+    try:
+        # A directory fd makes os.link use linkat(), which can follow
+        # the /proc magic link to the unnamed file (plain link() can't)
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.link(f"/proc/self/fd/{fd}", path.name, dst_dir_fd=dir_fd, follow_symlinks=True)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        # /proc isn't mounted (some containers and sandboxes) or linkat was refused
+        return False
+    return True
+
+
+def atomic_write(
+    path: Union[str, Path],
+    data: Union[str, bytes],
+    encoding: str = "utf-8",
+) -> None:
+    """
+    Write data to a file atomically.
+    
+    The content is written to a temporary file in the same directory and then
+    moved into place with os.replace, so readers never observe a partial file.
+    On Linux the temporary file is created unnamed (O_TMPFILE) and only linked
+    into the directory once fully written, so a crash mid-write leaves nothing
+    behind; where that link fails, a named temporary file is used instead.
+    
+    Args:
+        path: Destination file path.
+        data: Text or bytes to write.
+        encoding: Encoding used when data is text (default: UTF-8).
+    """
+    path = Path(path)
+    
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    
+    tmp_path = path.with_name(f".{path.name}.{token_hex(4)}.tmp")
+    
+    fd = _open_unnamed(path.parent)
+    try:
+        linked = False
+        if fd is not None:
+            try:
+                _write_all(fd, data)
+                linked = _link_unnamed(fd, tmp_path)
+            finally:
+                os.close(fd)
+        if not linked:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                _write_all(fd, data)
+            finally:
+                os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def sortable_id() -> str:
+    """
+    Generate a random, time-ordered identifier.
+    
+    The first 12 hex digits are the Unix time in milliseconds and the other
+    20 are random, so ids sort by creation time (like a ULID) while keeping
+    the 32-character hex form of token_hex(16). New rows then land at the
+    end of a primary key index instead of at random pages.
+    
+    Returns:
+        A 32-character lowercase hex string.
+    """
+    return f"{time.time_ns() // 1_000_000:012x}{token_hex(10)}"
+
+
+class TTLCache:
+    """
+    Thread-safe mapping with a size bound and per-entry expiry.
+    
+    Entries expire ``ttl`` seconds after they were last read or written, and
+    the least recently used entry is evicted once ``maxsize`` is reached.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def _expire(self, now: float) -> None:
+        # Entries are kept in access order, so expired ones sit at the front
+        while self._data:
+            key, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+    
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Get a value and refresh its expiry.
+        
+        Args:
+            key: Entry key.
+            default: Value returned when the key is missing or expired.
+            
+        Returns:
+            The stored value, or default.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if key not in self._data:
+                return default
+            _, value = self._data[key]
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __getitem__(self, key: Hashable) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+    
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            self._expire(time.monotonic())
+            return key in self._data
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._data)
@@ -63,3 +63,8 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("OPENROUTER_MODEL", "test-model")
     monkeypatch.setenv("WHISPER_MODEL", "small")
     monkeypatch.setenv("WHISPER_LANGUAGE", "ar")
+    # get_config() is cached per process, so rebuild it around the new environment
+    from video_summarizer.config import get_config
+    get_config.cache_clear()
+    yield
+    get_config.cache_clear()
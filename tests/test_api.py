@@ -0,0 +1,288 @@
+"""
+Tests for the API module.
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from video_summarizer.api import auth, main
+from video_summarizer.db import database, models, get_db
+from video_summarizer.utils import TTLCache
+
+
+@pytest.fixture
+def db_session_factory(temp_dir, monkeypatch):
+    """Point the API at a fresh SQLite database in a temporary directory."""
+    engine = create_engine(f"sqlite:///{temp_dir / 'test.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    main.app.dependency_overrides[get_db] = override_get_db
+    yield factory
+    main.app.dependency_overrides.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    """Mock LLM client handed to chat sessions instead of a real provider."""
+    client = Mock()
+    client.complete_stream.side_effect = lambda **kwargs: iter(["Hel", "lo"])
+    monkeypatch.setattr(main, "get_summarizer", lambda provider, model: Mock(client=client))
+    monkeypatch.setattr(main, "chat_sessions", TTLCache(maxsize=10, ttl=3600))
+    return client
+
+
+@pytest.fixture
+def user_id(db_session_factory):
+    """Create a user and authenticate every request as them."""
+    db = db_session_factory()
+    try:
+        user = models.User(email="user@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+    main.app.dependency_overrides[auth.get_current_user] = lambda: Mock(id=user_id)
+    return user_id
+
+
+@pytest.fixture
+def api(db_session_factory, user_id):
+    """Create an authenticated API test client (lifespan not run, so no worker pools)."""
+    return TestClient(main.app)
+
+
+def _sse_tokens(response):
+    return [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+
+
+class TestChatSessions:
+    """Tests for chat sessions persisted in the database."""
+    
+    def _start(self, api):
+        response = api.post("/api/chat/start", json={"transcript_text": "A short transcript"})
+        assert response.status_code == 200
+        return response.json()["session_id"]
+    
+    def test_history_persisted_across_cache_eviction(self, api, llm_client, db_session_factory, monkeypatch):
+        """Test that a session rebuilt from the database continues its saved history."""
+        session_id = self._start(api)
+        
+        response = api.post("/api/chat/message", json={"session_id": session_id, "message": "One"})
+        assert _sse_tokens(response) == ["Hel", "lo"]
+        
+        db = db_session_factory()
+        try:
+            assert db.get(models.Chat, session_id).history == [
+                {"role": "user", "content": "One"},
+                {"role": "assistant", "content": "Hello"},
+            ]
+        finally:
+            db.close()
+        
+        # A different worker (or an evicted cache) rebuilds the session from the row
+        monkeypatch.setattr(main, "chat_sessions", TTLCache(maxsize=10, ttl=3600))
+        api.post("/api/chat/message", json={"session_id": session_id, "message": "Two"})
+        
+        assert llm_client.complete_stream.call_args.kwargs["history"] == [
+            {"role": "user", "content": "One"},
+            {"role": "assistant", "content": "Hello"},
+        ]
+    
+    def test_requests_get_separate_histories(self, api, llm_client):
+        """Test that concurrent requests to one session don't share a history list."""
+        session_id = self._start(api)
+        
+        first = main._load_chat_session(session_id)
+        second = main._load_chat_session(session_id)
+        first.history.append(main.ChatMessage(role="user", content="Only in first"))
+        
+        assert first is not second
+        assert second.history == []
+        assert first.client is second.client
+        assert first._get_system_prompt() is second._get_system_prompt()
+    
+    def test_expired_session_rejected_and_purged(self, api, llm_client, db_session_factory):
+        """Test that idle sessions stop answering and are deleted by the purge."""
+        session_id = self._start(api)
+        
+        db = db_session_factory()
+        try:
+            db.query(models.Chat).filter(models.Chat.id == session_id).update(
+                {"updated_at": datetime.utcnow() - timedelta(seconds=main.CHAT_SESSION_TTL_SECONDS + 1)}
+            )
+            db.commit()
+        finally:
+            db.close()
+        
+        response = api.post("/api/chat/message", json={"session_id": session_id, "message": "Hi"})
+        
+        assert response.status_code == 404
+        assert main.purge_expired_chats() == 1
+        llm_client.complete_stream.assert_not_called()
+
+
+class TestLibraryTranscripts:
+    """Tests for using library transcripts by video id."""
+    
+    @pytest.fixture
+    def video_ids(self, db_session_factory, user_id):
+        db = db_session_factory()
+        try:
+            other = models.User(email="other@example.com", hashed_password="x")
+            db.add(other)
+            db.commit()
+            own = models.Video(title="Mine", user_id=user_id, transcript_text="My transcript")
+            foreign = models.Video(title="Theirs", user_id=other.id, transcript_text="Their transcript")
+            db.add_all([own, foreign])
+            db.commit()
+            return own.id, foreign.id
+        finally:
+            db.close()
+    
+    def test_own_video_transcript_used(self, api, llm_client, video_ids):
+        """Test that a chat can start from the user's own library video."""
+        response = api.post("/api/chat/start", json={"video_id": video_ids[0]})
+        
+        assert response.status_code == 200
+        assert main.chat_sessions[response.json()["session_id"]].transcript == "My transcript"
+    
+    def test_other_users_video_not_readable(self, api, llm_client, video_ids):
+        """Test that another user's video id gives no transcript."""
+        response = api.post("/api/chat/start", json={"video_id": video_ids[1]})
+        
+        assert response.status_code == 400
+        assert len(main.chat_sessions) == 0
+    
+    def test_endpoints_require_authentication(self, api):
+        """Test that transcript-reading endpoints reject anonymous requests."""
+        main.app.dependency_overrides.pop(auth.get_current_user)
+        
+        for path in ("/api/summarize", "/api/chat/start", "/api/extract-clips"):
+            assert api.post(path, json={"video_id": 1}).status_code == 401
+
+
+class TestEtag:
+    """Tests for ETag revalidation of library responses."""
+    
+    @pytest.fixture
+    def library(self, api, db_session_factory, user_id):
+        db = db_session_factory()
+        try:
+            db.add(models.Video(title="Lecture", user_id=user_id))
+            db.commit()
+        finally:
+            db.close()
+        return api
+    
+    def test_response_carries_etag(self, library):
+        """Test that a fresh request gets the body, an ETag and a revalidation policy."""
+        response = library.get("/api/library")
+        
+        assert response.status_code == 200
+        assert response.json()[0]["title"] == "Lecture"
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "private, no-cache"
+    
+    def test_matching_etag_returns_not_modified(self, library):
+        """Test that a matching If-None-Match gets an empty 304."""
+        etag = library.get("/api/library").headers["etag"]
+        
+        response = library.get("/api/library", headers={"If-None-Match": f'"other", {etag}'})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "private, no-cache"
+    
+    def test_weak_etag_returns_not_modified(self, library):
+        """Test that a W/-prefixed tag, as echoed back after gzip, still matches."""
+        etag = library.get("/api/library").headers["etag"]
+        
+        response = library.get("/api/library", headers={"If-None-Match": f"W/{etag}"})
+        
+        assert response.status_code == 304
+    
+    def test_stale_etag_returns_body(self, library):
+        """Test that a tag for an older version of the library gets the full response."""
+        response = library.get("/api/library", headers={"If-None-Match": '"stale"'})
+        
+        assert response.status_code == 200
+        assert response.json()[0]["title"] == "Lecture"
+
+
+class TestStalledJobs:
+    """Tests for failing jobs lost to a restart."""
+    
+    def _add_jobs(self, db_session_factory, updated_at):
+        db = db_session_factory()
+        try:
+            for job_id, status in (("queued", main.JobStatus.PENDING), ("running", main.JobStatus.PROCESSING)):
+                db.add(models.Job(id=job_id, type="transcribe", status=status, updated_at=updated_at))
+            db.commit()
+        finally:
+            db.close()
+    
+    def _statuses(self, db_session_factory):
+        db = db_session_factory()
+        try:
+            return {job.id: job.status for job in db.query(models.Job)}
+        finally:
+            db.close()
+    
+    def test_queued_job_of_this_process_kept(self, db_session_factory, monkeypatch):
+        """Test that a pending job still waiting in this process's queue isn't failed."""
+        stale = datetime.utcnow() - main.JOB_STALL_TIMEOUT - timedelta(minutes=1)
+        monkeypatch.setattr(main, "PROCESS_STARTED_AT", stale - timedelta(hours=1))
+        self._add_jobs(db_session_factory, stale)
+        
+        assert main.fail_stalled_jobs() == 1
+        assert self._statuses(db_session_factory) == {"queued": main.JobStatus.PENDING, "running": main.JobStatus.FAILED}
+    
+    def test_jobs_from_before_restart_failed(self, db_session_factory, monkeypatch):
+        """Test that pending and processing jobs left by an earlier process are failed."""
+        stale = datetime.utcnow() - main.JOB_STALL_TIMEOUT - timedelta(minutes=1)
+        monkeypatch.setattr(main, "PROCESS_STARTED_AT", datetime.utcnow())
+        self._add_jobs(db_session_factory, stale)
+        
+        assert main.fail_stalled_jobs() == 2
+        assert set(self._statuses(db_session_factory).values()) == {main.JobStatus.FAILED}
+
+
+class TestJobEvents:
+    """Tests for watching a job's status."""
+    
+    def test_watch_stops_when_client_disconnects(self, monkeypatch):
+        """Test that a closed stream stops polling instead of waiting for the job to end."""
+        load_state = Mock(return_value={"status": main.JobStatus.PROCESSING})
+        monkeypatch.setattr(main, "_load_job_state", load_state)
+        monkeypatch.setattr(main, "JOB_EVENTS_REFRESH_SECONDS", 0.01)
+        disconnected = iter([False, True])
+        
+        async def is_disconnected():
+            return next(disconnected)
+        
+        async def watch():
+            return [update async for update in main._watch_job("job", {"status": main.JobStatus.PENDING}, is_disconnected)]
+        
+        updates = asyncio.run(watch())
+        
+        assert [update["status"] for update in updates] == [main.JobStatus.PENDING, main.JobStatus.PROCESSING]
+        assert load_state.call_count == 1
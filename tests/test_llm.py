@@ -4,6 +4,7 @@ Tests for the LLM module.
 
 import json
 import pytest
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 from video_summarizer.llm.models import Clip, Summary
@@ -153,6 +154,412 @@ class TestPrompts:
         assert "timestamp" in user.lower() or "start" in user.lower()
 
 
+class TestParseJsonResponse:
+    """Tests for extracting JSON from LLM responses."""
+    
+    def test_plain_and_fenced_json(self):
+        """Test bare JSON, fenced blocks and JSON surrounded by prose."""
+        from video_summarizer.llm.client import _parse_json_response
+        
+        assert _parse_json_response('{"a": 1}') == {"a": 1}
+        assert _parse_json_response('```json\n{"a": 1}\n```') == {"a": 1}
+        assert _parse_json_response('Here you go:\n```\n{"a": 1}\n```\nDone') == {"a": 1}
+        assert _parse_json_response('Sure! {"a": [1, 2]} Hope that helps.') == {"a": [1, 2]}
+    
+    def test_braces_in_trailing_prose_ignored(self):
+        """Test that braces after the object don't extend the match."""
+        from video_summarizer.llm.client import _parse_json_response
+        
+        response = 'Result: {"a": "x}y"} -- note: use {placeholders} as needed.'
+        
+        assert _parse_json_response(response) == {"a": "x}y"}
+    
+    def test_escaped_quotes_and_nesting_in_first_object(self):
+        """Test that escaped quotes and nested objects don't end the object early."""
+        from video_summarizer.llm.client import _parse_json_response
+        
+        response = 'Here: {"q": "say \\"}\\"", "b": {"c": [1]}} and {more}'
+        
+        assert _parse_json_response(response) == {"q": 'say "}"', "b": {"c": [1]}}
+    
+    def test_truncated_json_repaired(self):
+        """Test that a response cut off mid-array keeps its complete items."""
+        from video_summarizer.llm.client import _parse_json_response
+        
+        response = '```json\n{"clips": [{"start": 1, "end": 2}, {"start": 3, "impor'
+        
+        assert _parse_json_response(response) == {"clips": [{"start": 1, "end": 2}]}
+
+
+class TestPromptCaching:
+    """Tests for marking long system prompts as provider cache breakpoints."""
+    
+    def test_long_system_prompt_marked_cacheable(self):
+        """Test that a transcript-sized system prompt gets a cache_control breakpoint."""
+        from video_summarizer.llm.client import _build_messages, PROMPT_CACHE_MIN_CHARS
+        
+        system = "x" * PROMPT_CACHE_MIN_CHARS
+        messages = _build_messages("Question?", system)
+        
+        assert messages[0]["content"][0] == {
+            "type": "text",
+            "text": system,
+            "cache_control": {"type": "ephemeral"},
+        }
+        assert messages[1] == {"role": "user", "content": "Question?"}
+    
+    def test_short_system_prompt_left_plain(self):
+        """Test that short system prompts stay plain strings."""
+        from video_summarizer.llm.client import _build_messages
+        
+        assert _build_messages("Hi", "Be brief") == [
+            {"role": "system", "content": "Be brief"},
+            {"role": "user", "content": "Hi"},
+        ]
+        assert _build_messages("Hi") == [{"role": "user", "content": "Hi"}]
+    
+    def test_history_placed_between_system_and_prompt(self):
+        """Test that earlier chat turns keep the system prompt as a stable prefix."""
+        from video_summarizer.llm.client import _build_messages, _build_gemini_contents
+        
+        history = [{"role": "user", "content": "Q1"}, {"role": "assistant", "content": "A1"}]
+        
+        assert _build_messages("Q2", "Sys", history) == [
+            {"role": "system", "content": "Sys"},
+            {"role": "user", "content": "Q1"},
+            {"role": "assistant", "content": "A1"},
+            {"role": "user", "content": "Q2"},
+        ]
+        assert _build_gemini_contents("Q2", "Sys", history) == [
+            {"role": "user", "parts": ["Sys\n\nQ1"]},
+            {"role": "model", "parts": ["A1"]},
+            {"role": "user", "parts": ["Q2"]},
+        ]
+
+
+class TestRetries:
+    """Tests for retrying failed LLM API calls."""
+    
+    def _client(self, errors):
+        from video_summarizer.llm.client import OpenRouterClient
+        
+        client = OpenRouterClient(api_key="key", model="m")
+        sdk = Mock()
+        sdk.chat.completions.create.side_effect = errors
+        client._client = sdk
+        return client, sdk
+    
+    def _error(self, status, headers=None):
+        error = Exception(f"HTTP {status}")
+        error.status_code = status
+        error.response = Mock(headers=headers or {})
+        return error
+    
+    def test_client_errors_fail_fast(self):
+        """Test that a non-retriable 4xx error is not retried."""
+        from video_summarizer.llm.client import LLMClientError
+        
+        client, sdk = self._client([self._error(401)])
+        
+        with patch("video_summarizer.llm.client.time.sleep") as sleep, pytest.raises(LLMClientError):
+            client.complete("Hi")
+        
+        assert sdk.chat.completions.create.call_count == 1
+        sleep.assert_not_called()
+    
+    def test_stream_open_retried(self):
+        """Test that a rate-limited stream request is retried before any token."""
+        chunk = Mock(choices=[Mock(delta=Mock(content="Hi"))])
+        client, sdk = self._client([self._error(429, {"retry-after": "1"}), iter([chunk])])
+        
+        with patch("video_summarizer.llm.client.time.sleep") as sleep:
+            assert list(client.complete_stream("Hi")) == ["Hi"]
+        
+        assert sdk.chat.completions.create.call_count == 2
+        sleep.assert_called_once_with(1.0)
+    
+    def test_rate_limit_honors_retry_after(self):
+        """Test that a 429 is retried after the server's Retry-After."""
+        reply = Mock(choices=[Mock(message=Mock(content="Done"))])
+        client, sdk = self._client([self._error(429, {"retry-after": "2"}), reply])
+        
+        with patch("video_summarizer.llm.client.time.sleep") as sleep:
+            assert client.complete("Hi") == "Done"
+        
+        sleep.assert_called_once_with(2.0)
+    
+    def test_backoff_is_exponential_with_jitter(self):
+        """Test that server errors back off exponentially within the jitter range."""
+        from video_summarizer.llm.client import _retry_delay
+        
+        error = self._error(503)
+        
+        assert 0.5 <= _retry_delay(error, 0, 1.0) <= 1.5
+        assert 2.0 <= _retry_delay(error, 2, 1.0) <= 6.0
+        assert _retry_delay(ConnectionError("reset"), 0, 1.0) is not None
+
+
+class TestCompleteMany:
+    """Tests for sending several prompts concurrently."""
+    
+    def test_results_in_order_with_failures_returned(self):
+        """Test that results keep prompt order and failures don't abort the batch."""
+        from video_summarizer.llm.client import complete_many, LLMClientError
+        
+        def complete(prompt, system=None):
+            if prompt == "bad":
+                raise LLMClientError("boom")
+            return prompt.upper()
+        
+        client = Mock()
+        client.complete.side_effect = complete
+        
+        results = complete_many(client, ["a", "bad", "c"], system="Sys", concurrency=2)
+        
+        assert results[0] == "A" and results[2] == "C"
+        assert isinstance(results[1], LLMClientError)
+        assert all(call.kwargs["system"] == "Sys" for call in client.complete.call_args_list)
+    
+    def test_concurrency_bounded(self):
+        """Test that no more than `concurrency` requests run at once."""
+        import threading
+        import time
+        from video_summarizer.llm.client import complete_many
+        
+        lock = threading.Lock()
+        running = []
+        peak = []
+        
+        def complete(prompt, system=None):
+            with lock:
+                running.append(prompt)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(prompt)
+            return prompt
+        
+        client = Mock()
+        client.complete.side_effect = complete
+        
+        assert complete_many(client, [str(i) for i in range(6)], concurrency=2) == [str(i) for i in range(6)]
+        assert max(peak) == 2
+
+
+class TestSharedClients:
+    """Tests for reusing HTTP and SDK clients across LLM clients."""
+    
+    def test_openrouter_clients_share_sdk_client(self):
+        """Test that clients for different models reuse one OpenAI client and pool."""
+        from video_summarizer.llm.client import OpenRouterClient, get_shared_http_client
+        
+        first = OpenRouterClient(api_key="key", model="a", base_url="https://example.test/v1")
+        second = OpenRouterClient(api_key="key", model="b", base_url="https://example.test/v1")
+        
+        assert first._get_client() is second._get_client()
+        assert first._get_client()._client is get_shared_http_client()
+    
+    def test_explicit_http_client_not_shared(self):
+        """Test that a client given its own HTTP client gets its own SDK client."""
+        import httpx
+        from video_summarizer.llm.client import OpenRouterClient
+        
+        own = httpx.Client()
+        client = OpenRouterClient(api_key="key", model="a", base_url="https://example.test/v1", http_client=own)
+        shared = OpenRouterClient(api_key="key", model="a", base_url="https://example.test/v1")
+        
+        assert client._get_client() is not shared._get_client()
+        assert client._get_client()._client is own
+
+
+class TestSummarizerProcess:
+    """Tests for producing the summary and clips together."""
+    
+    def test_summary_and_clips_requests_overlap(self):
+        """Test that both LLM requests are in flight at the same time."""
+        import threading
+        from video_summarizer.llm.summarizer import VideoSummarizer
+        
+        both_started = threading.Barrier(2, timeout=5)
+        
+        def complete_json(prompt, system, **kwargs):
+            both_started.wait()
+            if "clips" in prompt.lower():
+                return {"clips": [{"start": 0, "end": 5, "title": "Clip", "importance": 5}]}
+            return {"summary": "Short", "key_points": []}
+        
+        client = Mock(model="test-model")
+        client.complete_json.side_effect = complete_json
+        
+        summary, clips = VideoSummarizer(client=client).process("Transcript", num_clips=1)
+        
+        assert summary.text == "Short"
+        assert [clip.title for clip in clips] == ["Clip"]
+
+
+class TestResponseCache:
+    """Tests for caching LLM responses on disk."""
+    
+    def _summarizer(self, temp_dir, ttl=3600):
+        from video_summarizer.llm.cache import ResponseCache
+        from video_summarizer.llm.summarizer import VideoSummarizer
+        
+        client = Mock(model="test-model")
+        client.complete_json.return_value = {"summary": "Short", "key_points": ["a"]}
+        return VideoSummarizer(client=client, cache=ResponseCache(temp_dir, ttl=ttl)), client
+    
+    def test_identical_request_served_from_cache(self, temp_dir):
+        """Test that repeating a request does not call the LLM again."""
+        summarizer, client = self._summarizer(temp_dir)
+        
+        first = summarizer.summarize("Transcript")
+        second = summarizer.summarize("Transcript")
+        
+        assert client.complete_json.call_count == 1
+        assert second.text == first.text == "Short"
+    
+    def test_different_request_misses(self, temp_dir):
+        """Test that a different transcript or language is a cache miss."""
+        summarizer, client = self._summarizer(temp_dir)
+        
+        summarizer.summarize("Transcript")
+        summarizer.summarize("Other transcript")
+        summarizer.summarize("Transcript", output_language="english")
+        
+        assert client.complete_json.call_count == 3
+    
+    def test_expired_entries_miss(self, temp_dir):
+        """Test that entries older than the TTL are refreshed."""
+        summarizer, client = self._summarizer(temp_dir, ttl=60)
+        
+        summarizer.summarize("Transcript")
+        written = next(Path(temp_dir).glob("*.json")).stat().st_mtime
+        with patch("video_summarizer.llm.cache.time.time", return_value=written + 61):
+            summarizer.summarize("Transcript")
+        
+        assert client.complete_json.call_count == 2
+
+
+class TestChatSession:
+    """Tests for chat sessions."""
+    
+    def _session(self, tokens):
+        from video_summarizer.llm.chat import ChatSession
+        
+        client = Mock()
+        client.complete_stream.side_effect = lambda **kwargs: iter(tokens)
+        return ChatSession(transcript="Transcript", client=client), client
+    
+    def test_chat_drains_stream(self):
+        """Test that chat returns the joined stream and records both turns."""
+        session, client = self._session(["Hel", "lo"])
+        
+        assert session.chat("Hi") == "Hello"
+        assert session.get_history() == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello"},
+        ]
+        client.complete.assert_not_called()
+    
+    def test_stream_yields_first_token_before_completion(self):
+        """Test that tokens are yielded as they arrive and history is kept paired."""
+        session, _ = self._session(["First", " second"])
+        
+        stream = session.chat_stream("Hi")
+        assert next(stream) == "First"
+        assert len(session.history) == 1
+        stream.close()
+        
+        assert session.get_history()[-1] == {"role": "assistant", "content": "First"}
+    
+    def test_failed_request_leaves_history_unchanged(self):
+        """Test that a request failing before any token doesn't leave an empty turn."""
+        from video_summarizer.llm.client import LLMClientError
+        
+        session, client = self._session(["Answer"])
+        session.chat("One")
+        client.complete_stream.side_effect = LLMClientError("boom")
+        
+        with pytest.raises(LLMClientError):
+            session.chat("Two")
+        
+        assert session.get_history() == [
+            {"role": "user", "content": "One"},
+            {"role": "assistant", "content": "Answer"},
+        ]
+    
+    def test_follow_up_sends_history_as_messages(self):
+        """Test that earlier turns are passed as messages after an unchanged system prompt."""
+        session, client = self._session(["Answer"])
+        
+        session.chat("One")
+        first = client.complete_stream.call_args.kwargs
+        session.chat("Two")
+        second = client.complete_stream.call_args.kwargs
+        
+        assert first["history"] == []
+        assert second["prompt"] == "Two"
+        assert second["system"] == first["system"]
+        assert second["history"] == [
+            {"role": "user", "content": "One"},
+            {"role": "assistant", "content": "Answer"},
+        ]
+    
+    def test_system_prompt_rendered_once_per_transcript(self):
+        """Test that the system prompt is reused until the transcript is replaced."""
+        session, _ = self._session([])
+        
+        prompt = session._get_system_prompt()
+        version = session.transcript_version
+        
+        assert session._get_system_prompt() is prompt
+        assert len(version) == 32
+        
+        session.transcript = "Another transcript"
+        
+        assert "Another transcript" in session._get_system_prompt()
+        assert session.transcript_version != version
+    
+    def test_prepared_session_copies_share_prompt(self):
+        """Test that copies of a prepared session reuse its rendered prompt."""
+        import copy
+        
+        session, _ = self._session([])
+        session.prepare()
+        
+        assert copy.copy(session)._get_system_prompt() is session._get_system_prompt()
+    
+    def test_long_transcript_sends_relevant_excerpts(self):
+        """Test that an over-budget transcript is cut down to excerpts matching the question."""
+        from video_summarizer.llm import chat
+        from video_summarizer.llm.chat import ChatSession
+        
+        transcript = "\n".join([
+            "We start by talking about cooking pasta and sauce.",
+            "Next the speaker explains how rockets reach orbit.",
+            "Finally there is a recap about gardening tomatoes.",
+        ])
+        client = Mock()
+        client.complete_stream.side_effect = lambda **kwargs: iter(["Ok"])
+        session = ChatSession(transcript=transcript, client=client, max_transcript_chars=60)
+        
+        with patch.object(chat, "EXCERPT_CHARS", 10):
+            session.chat("How do rockets get to orbit?")
+        system = client.complete_stream.call_args.kwargs["system"]
+        
+        assert "rockets reach orbit" in system
+        assert "pasta" not in system
+    
+    def test_transcript_within_budget_sent_in_full(self):
+        """Test that the full, cacheable prompt is used when no budget applies."""
+        session, client = self._session(["Ok"])
+        
+        session.chat("Anything?")
+        
+        assert session.max_transcript_chars == 0
+        assert client.complete_stream.call_args.kwargs["system"] is session._get_system_prompt()
+
+
 class TestClipMetadata:
     """Tests for clip metadata serialization."""
     
@@ -192,3 +599,109 @@ class TestClipMetadata:
         assert "clips" in data
         assert "total_clips" in data
         assert data["total_clips"] == len(sample_clips)
+
+
+class TestExtractClips:
+    """Tests for extracting multiple clips."""
+    
+    def test_extract_clips_keeps_order_and_skips_failures(self, sample_clips, temp_dir):
+        """Test that clips are returned in input order and failed clips are skipped."""
+        from video_summarizer.llm.clip_extractor import extract_clips, ClipExtractionError
+        
+        def fake_extract_clip(video_path, output_path, start, end, reencode=False):
+            if start == 45.0:
+                raise ClipExtractionError("boom")
+            return output_path
+        
+        with patch("video_summarizer.llm.clip_extractor.extract_clip", side_effect=fake_extract_clip):
+            extracted = extract_clips("video.mp4", sample_clips, str(temp_dir), max_workers=3)
+        
+        assert len(extracted) == 2
+        assert Path(extracted[0]).name == "clip_01_Introduction.mp4"
+        assert Path(extracted[1]).name == "clip_03_Conclusion.mp4"
+    
+    def test_failed_stream_copy_retried_with_reencode(self, sample_clips, temp_dir):
+        """Test that only a clip whose stream copy fails is re-encoded."""
+        from video_summarizer.llm.clip_extractor import extract_clips, ClipExtractionError
+        
+        calls = []
+        
+        def fake_extract_clip(video_path, output_path, start, end, reencode=False):
+            calls.append((start, reencode))
+            if start == 45.0 and not reencode:
+                raise ClipExtractionError("copy failed")
+            return output_path
+        
+        with patch("video_summarizer.llm.clip_extractor.extract_clip", side_effect=fake_extract_clip):
+            extracted = extract_clips("video.mp4", sample_clips, str(temp_dir), max_workers=1)
+        
+        assert len(extracted) == 3
+        assert [c for c in calls if c[1]] == [(45.0, True)]
+    
+    def test_extract_clips_empty(self, temp_dir):
+        """Test that no clips produces no output."""
+        from video_summarizer.llm.clip_extractor import extract_clips
+        
+        assert extract_clips("video.mp4", [], str(temp_dir)) == []
+
+    def test_extract_clips_respects_process_wide_ffmpeg_cap(self, sample_clips, temp_dir):
+        """Test that concurrent FFmpeg cuts never exceed the shared slot count."""
+        import threading
+        import time
+        from video_summarizer.llm.clip_extractor import extract_clips
+
+        video = temp_dir / "video.mp4"
+        video.write_bytes(b"")
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def fake_run(cmd, **kwargs):
+            with lock:
+                running.append(cmd)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(cmd)
+
+        with patch("video_summarizer.llm.clip_extractor._ffmpeg_slots", threading.BoundedSemaphore(1)), \
+             patch("video_summarizer.llm.clip_extractor.subprocess.run", side_effect=fake_run):
+            extracted = extract_clips(str(video), sample_clips, str(temp_dir / "clips"), max_workers=3)
+
+        assert len(extracted) == 3
+        assert max(peak) == 1
+
+
+class TestMergeClips:
+    """Tests for merging clips."""
+    
+    def _run_merge(self, temp_dir, probes, reencode=False):
+        from video_summarizer.llm.clip_extractor import merge_clips
+        
+        with patch("video_summarizer.llm.clip_extractor._probe_stream_params", side_effect=probes), \
+             patch("video_summarizer.llm.clip_extractor.subprocess.run") as run:
+            merge_clips(["a.mp4", "b.mp4"], str(temp_dir / "merged.mp4"), reencode=reencode)
+        
+        return run.call_args[0][0]
+    
+    def test_merge_uses_stream_copy_for_matching_clips(self, temp_dir):
+        """Test that clips with identical codec parameters are not re-encoded."""
+        params = (("codec_name", "h264"),)
+        cmd = self._run_merge(temp_dir, [params, params])
+        
+        assert "concat" in cmd
+        assert "copy" in cmd
+        assert "libx264" not in cmd
+    
+    def test_merge_reencodes_mismatched_clips(self, temp_dir):
+        """Test that clips with different codec parameters fall back to re-encoding."""
+        cmd = self._run_merge(temp_dir, [(("codec_name", "h264"),), (("codec_name", "vp9"),)])
+        
+        assert "-filter_complex" in cmd
+        assert "libx264" in cmd
+    
+    def test_merge_reencode_forced(self, temp_dir):
+        """Test that reencode=True skips probing and re-encodes."""
+        cmd = self._run_merge(temp_dir, [], reencode=True)
+        
+        assert "-filter_complex" in cmd
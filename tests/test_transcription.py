@@ -4,6 +4,7 @@ Tests for the transcription module.
 
 import pytest
 from pathlib import Path
+from unittest.mock import patch, Mock
 
 from video_summarizer.transcription.transcriber import TranscriptionSegment
 from video_summarizer.transcription.srt_formatter import (
@@ -12,6 +13,7 @@ from video_summarizer.transcription.srt_formatter import (
     parse_srt,
     save_srt,
     load_srt,
+    srt_to_text,
 )
 from video_summarizer.transcription.youtube_downloader import is_youtube_url
 
@@ -149,6 +151,269 @@ class TestSaveLoadSrt:
         # Decode and verify content
         text = content.decode("utf-8")
         assert "مرحباً" in text
+    
+    def test_save_overwrites_atomically(self, sample_segments, temp_dir):
+        """Test that saving replaces the file without leaving temp files behind."""
+        output_path = temp_dir / "test.srt"
+        output_path.write_text("stale content", encoding="utf-8")
+        
+        save_srt(sample_segments, output_path)
+        
+        assert list(temp_dir.iterdir()) == [output_path]
+        assert "stale content" not in output_path.read_text(encoding="utf-8")
+        assert len(load_srt(output_path)) == len(sample_segments)
+
+
+class TestSrtToText:
+    """Tests for streaming SRT text extraction."""
+    
+    def test_matches_load_srt(self, sample_srt_content, temp_dir):
+        """Test that the text matches joining the parsed segments."""
+        path = temp_dir / "test.srt"
+        path.write_text(sample_srt_content, encoding="utf-8")
+        
+        expected = "\n".join(seg.text for seg in load_srt(path))
+        
+        assert srt_to_text(path) == expected
+    
+    def test_keeps_numeric_and_multiline_text(self, temp_dir):
+        """Test that numeric text lines and multi-line entries are kept."""
+        path = temp_dir / "test.srt"
+        path.write_text(
+            "1\n00:00:00,000 --> 00:00:01,000\n42\n\n"
+            "2\n00:00:01,000 --> 00:00:02,000\nfirst line\nsecond line\n",
+            encoding="utf-8",
+        )
+        
+        assert srt_to_text(path) == "42\nfirst line\nsecond line"
+    
+    def test_skips_entries_with_malformed_timing(self, temp_dir):
+        """Test that entries parse_srt rejects are left out of the text too."""
+        path = temp_dir / "test.srt"
+        path.write_text("1\nxx --> yy\nHi\n\n2\n00:00:01,000 --> 00:00:02,000\nBye\n", encoding="utf-8")
+        
+        assert srt_to_text(path) == "Bye"
+        assert srt_to_text(path) == "\n".join(seg.text for seg in load_srt(path))
+    
+    def test_empty_file(self, temp_dir):
+        """Test that an empty file gives empty text."""
+        path = temp_dir / "empty.srt"
+        path.write_text("", encoding="utf-8")
+        
+        assert srt_to_text(path) == ""
+
+
+class TestAudioInput:
+    """Tests for in-memory audio extraction and transcriber audio inputs."""
+    
+    def test_extract_audio_array_decodes_pipe(self, temp_dir):
+        """Test that FFmpeg's float32 PCM output is returned as an array."""
+        import numpy as np
+        from video_summarizer.transcription.audio_extractor import extract_audio_array
+        
+        video = temp_dir / "video.mp4"
+        video.write_bytes(b"")
+        samples = np.array([0.0, 0.5, -0.5], dtype=np.float32)
+        
+        with patch(
+            "video_summarizer.transcription.audio_extractor.subprocess.run",
+            return_value=Mock(stdout=samples.tobytes()),
+        ) as run:
+            audio = extract_audio_array(str(video))
+        
+        assert audio.dtype == np.float32
+        assert audio.tolist() == samples.tolist()
+        assert run.call_args[0][0][-1] == "-"
+    
+    def test_extract_audio_array_missing_file(self):
+        """Test error when the video doesn't exist."""
+        from video_summarizer.transcription.audio_extractor import extract_audio_array
+        
+        with pytest.raises(FileNotFoundError):
+            extract_audio_array("/nonexistent/video.mp4")
+    
+    def test_transcriber_accepts_array(self):
+        """Test that arrays are passed through and missing paths are rejected."""
+        from video_summarizer.transcription.transcriber import WhisperTranscriber
+        
+        audio = [0.0, 0.1]
+        
+        assert WhisperTranscriber._resolve_audio(audio) is audio
+        with pytest.raises(FileNotFoundError):
+            WhisperTranscriber._resolve_audio("/nonexistent/audio.wav")
+
+
+class TestBatchedTranscription:
+    """Tests for batched Whisper inference."""
+    
+    def _transcriber(self, batch_size):
+        from video_summarizer.transcription.transcriber import WhisperTranscriber
+        
+        transcriber = WhisperTranscriber(language="en", batch_size=batch_size)
+        transcriber._model = Mock()
+        segment = Mock(start=0.0, end=1.0, text=" Hello ")
+        transcriber._model.transcribe.return_value = ([segment], None)
+        return transcriber
+    
+    def test_batched_pipeline_used(self):
+        """Test that batch sizes above 1 go through the batched pipeline."""
+        transcriber = self._transcriber(batch_size=4)
+        pipeline = Mock()
+        pipeline.transcribe.return_value = ([Mock(start=0.0, end=1.0, text=" Hi ")], None)
+        
+        with patch("faster_whisper.BatchedInferencePipeline", return_value=pipeline) as factory:
+            segments = transcriber.transcribe([0.0], language="en")
+            transcriber.transcribe([0.0], language="en")
+        
+        factory.assert_called_once_with(model=transcriber._model)
+        assert pipeline.transcribe.call_args.kwargs["batch_size"] == 4
+        assert segments[0].text == "Hi"
+        transcriber._model.transcribe.assert_not_called()
+    
+    def test_batch_size_one_is_sequential(self):
+        """Test that batch_size=1 keeps the sequential model path."""
+        transcriber = self._transcriber(batch_size=1)
+        
+        segments = transcriber.transcribe([0.0], language="en")
+        
+        assert segments[0].text == "Hello"
+        transcriber._model.transcribe.assert_called_once()
+
+    def test_per_call_batch_size_overrides_default(self):
+        """Test that a batch_size passed to transcribe wins over the instance default."""
+        transcriber = self._transcriber(batch_size=8)
+
+        segments = transcriber.transcribe([0.0], language="en", batch_size=1)
+
+        assert segments[0].text == "Hello"
+        transcriber._model.transcribe.assert_called_once()
+
+    def test_streaming_yields_and_wraps_errors(self):
+        """Test that streaming yields segments lazily and wraps decoder errors."""
+        from video_summarizer.transcription.transcriber import TranscriptionError
+        
+        transcriber = self._transcriber(batch_size=1)
+        
+        def failing_segments():
+            yield Mock(start=0.0, end=1.0, text=" First ")
+            raise RuntimeError("decoder crashed")
+        
+        transcriber._model.transcribe.return_value = (failing_segments(), None)
+        stream = transcriber.transcribe_streaming([0.0], language="en")
+        
+        assert next(stream).text == "First"
+        with pytest.raises(TranscriptionError):
+            next(stream)
+
+
+class TestRepetitionFilter:
+    """Tests for dropping Whisper hallucination loops."""
+    
+    def test_loop_detected(self):
+        """Test that a phrase repeated four times is flagged."""
+        from video_summarizer.transcription.transcriber import is_repetition_loop
+        
+        assert is_repetition_loop("thank you for watching " * 4)
+        assert not is_repetition_loop("thank you for watching " * 3)
+        assert not is_repetition_loop("A normal sentence with no repeated phrases at all in it, really none.")
+    
+    def test_looping_segments_dropped(self):
+        """Test that looping segments are skipped and decoding is unconditioned."""
+        from video_summarizer.transcription.transcriber import WhisperTranscriber
+        
+        transcriber = WhisperTranscriber(language="en", batch_size=1)
+        transcriber._model = Mock()
+        transcriber._model.transcribe.return_value = ([
+            Mock(start=0.0, end=1.0, text=" Hello "),
+            Mock(start=1.0, end=30.0, text=" subscribe to the channel" * 5),
+        ], None)
+        
+        segments = transcriber.transcribe([0.0])
+        
+        assert [s.text for s in segments] == ["Hello"]
+        assert transcriber._model.transcribe.call_args.kwargs["condition_on_previous_text"] is False
+
+
+class TestComputeType:
+    """Tests for Whisper compute type selection."""
+    
+    def test_cpu_uses_int8(self):
+        """Test that CPU defaults and float16 settings are quantized to int8."""
+        from video_summarizer.transcription.transcriber import resolve_compute_type
+        
+        assert resolve_compute_type("cpu", "auto") == "int8"
+        assert resolve_compute_type("cpu", "float16") == "int8"
+        assert resolve_compute_type("cpu", "float32") == "float32"
+    
+    def test_gpu_uses_float16(self):
+        """Test that GPUs default to float16 and keep explicit settings."""
+        from video_summarizer.transcription.transcriber import resolve_compute_type
+        
+        assert resolve_compute_type("cuda", "auto") == "float16"
+        assert resolve_compute_type("cuda", None) == "float16"
+        assert resolve_compute_type("cuda", "int8_float16") == "int8_float16"
+
+
+class TestMultiGpu:
+    """Tests for spreading the model over several GPUs."""
+    
+    def _load(self, gpu_count, device="auto", device_index=None):
+        from video_summarizer.transcription.transcriber import WhisperTranscriber
+        
+        transcriber = WhisperTranscriber(device=device, device_index=device_index)
+        with patch("video_summarizer.transcription.transcriber._cuda_device_count", return_value=gpu_count), \
+             patch("faster_whisper.WhisperModel") as model:
+            transcriber.load_model()
+        return model.call_args.kwargs
+    
+    def test_all_gpus_used(self):
+        """Test that every visible GPU gets a replica and a worker."""
+        kwargs = self._load(gpu_count=2)
+        
+        assert kwargs["device"] == "cuda"
+        assert kwargs["device_index"] == [0, 1]
+        assert kwargs["num_workers"] == 2
+    
+    def test_pinned_worker_loads_one_gpu(self):
+        """Test that a pinned transcriber loads a single replica, wrapping around the GPUs."""
+        assert self._load(gpu_count=2, device_index=0)["device_index"] == 0
+        
+        kwargs = self._load(gpu_count=2, device_index=3)
+        assert kwargs["device_index"] == 1
+        assert "num_workers" not in kwargs
+    
+    def test_pinned_slot_used_by_shared_transcriber(self, monkeypatch):
+        """Test that pin_transcriber_gpu applies to transcribers from get_transcriber."""
+        from video_summarizer.transcription import transcriber
+        
+        monkeypatch.setattr(transcriber, "_default_device_index", None)
+        transcriber._build_transcriber.cache_clear()
+        transcriber.pin_transcriber_gpu(1)
+        try:
+            assert transcriber.get_transcriber(model="tiny").device_index == 1
+        finally:
+            transcriber._build_transcriber.cache_clear()
+    
+    def test_single_gpu_and_cpu_unchanged(self):
+        """Test that one GPU or a CPU load keeps the default device placement."""
+        assert "device_index" not in self._load(gpu_count=1)
+        
+        kwargs = self._load(gpu_count=0)
+        assert kwargs["device"] == "cpu"
+        assert "device_index" not in kwargs
+
+
+class TestSharedTranscriber:
+    """Tests for the cached transcriber factory."""
+
+    def test_same_settings_share_instance(self):
+        """Test that keyword and positional calls with the same settings reuse one transcriber."""
+        from video_summarizer.transcription import get_transcriber
+
+        first = get_transcriber(model="tiny", device="cpu")
+
+        assert get_transcriber("tiny", "cpu") is first
+        assert get_transcriber(model="tiny", device="cpu", compute_type="int8") is not first
 
 
 class TestYouTubeUrlDetection:
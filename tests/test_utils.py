@@ -0,0 +1,93 @@
+"""
+Tests for shared utilities.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from video_summarizer.utils import atomic_write, sortable_id, TTLCache
+
+
+class TestAtomicWrite:
+    """Tests for atomic_write."""
+    
+    def test_writes_text_and_bytes(self, tmp_path):
+        """Test writing both text and bytes."""
+        path = tmp_path / "out.txt"
+        
+        atomic_write(path, "مرحبا")
+        assert path.read_text(encoding="utf-8") == "مرحبا"
+        
+        atomic_write(path, b"raw")
+        assert path.read_bytes() == b"raw"
+        assert list(tmp_path.iterdir()) == [path]
+    
+    def test_falls_back_without_o_tmpfile(self, tmp_path):
+        """Test the named temp file path used when O_TMPFILE is unavailable."""
+        path = tmp_path / "out.txt"
+        
+        with patch("video_summarizer.utils._open_unnamed", return_value=None):
+            atomic_write(path, "fallback")
+        
+        assert path.read_text() == "fallback"
+        assert list(tmp_path.iterdir()) == [path]
+    
+    def test_falls_back_when_link_refused(self, tmp_path):
+        """Test that a refused /proc link (no /proc mount, EPERM) still writes the file."""
+        path = tmp_path / "out.txt"
+        
+        with patch("video_summarizer.utils.os.link", side_effect=PermissionError):
+            atomic_write(path, "fallback")
+        
+        assert path.read_text() == "fallback"
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestSortableId:
+    """Tests for time-ordered ids."""
+    
+    def test_ids_sort_by_creation_time(self):
+        """Test that later ids sort after earlier ones and keep the hex format."""
+        with patch("video_summarizer.utils.time.time_ns", return_value=1_700_000_000_000_000_000):
+            first = sortable_id()
+        with patch("video_summarizer.utils.time.time_ns", return_value=1_700_000_000_001_000_000):
+            second = sortable_id()
+        
+        assert len(first) == len(second) == 32
+        int(first, 16)
+        assert first < second
+    
+    def test_ids_are_unique(self):
+        """Test that ids from the same millisecond still differ."""
+        with patch("video_summarizer.utils.time.time_ns", return_value=1_700_000_000_000_000_000):
+            ids = {sortable_id() for _ in range(100)}
+        
+        assert len(ids) == 100
+
+
+class TestTTLCache:
+    """Tests for the bounded TTL cache."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted at maxsize."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.get("a")
+        cache["c"] = 3
+        
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+    
+    def test_entries_expire(self):
+        """Test that entries disappear after the TTL."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        with patch("video_summarizer.utils.time.monotonic", return_value=100.0):
+            cache["a"] = 1
+        with patch("video_summarizer.utils.time.monotonic", return_value=159.0):
+            assert cache.get("a") == 1
+        with patch("video_summarizer.utils.time.monotonic", return_value=220.0):
+            assert cache.get("a") is None
+            with pytest.raises(KeyError):
+                cache["a"]